@@ -6,35 +6,156 @@ Provides endpoints for internship recommendations based on candidate profiles.
 """
 
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import logging
 import os
+import sys
+import queue
+import threading
+import time
+import functools
+from concurrent.futures import Future
 from recommendation_engine import InternshipRecommendationEngine
 import traceback
-from typing import Dict, Any
+from typing import Any, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, which also serializes numpy scalars and arrays."""
+
+    def _option(self) -> int:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if self.compact is False or (self.compact is None and self._app.debug):
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=self._option()).decode()
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        # Hand orjson's bytes straight to the response, skipping the str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._option())
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 CORS(app)  # Enable CORS for frontend integration
 
+class MicroBatchEncoder:
+    """Coalesces concurrent single-text encode calls into batched model.encode calls."""
+
+    def __init__(self, model, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._busy = threading.Lock()
+        self._worker_lock = threading.Lock()
+        self._worker_pid = None
+
+    def encode(self, texts: List[str], **kwargs):
+        """Encode texts, batching single-text calls that arrive while the model is busy.
+
+        Only calls without encode options are queued, since a batch is encoded with one set of
+        options; calls passing kwargs go straight to the model.
+        """
+        if len(texts) != 1 or kwargs:
+            return self.model.encode(texts, **kwargs)
+
+        # Nothing else in flight: encode inline so a lone request pays no queueing delay
+        if self._busy.acquire(blocking=False):
+            try:
+                return self.model.encode(texts, **kwargs)
+            finally:
+                self._busy.release()
+
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((texts[0], future))
+        return future.result()[None, :]
+
+    def _ensure_worker(self):
+        """Start the encoder thread in this process (threads do not survive a fork)."""
+        with self._worker_lock:
+            if self._worker_pid != os.getpid():
+                threading.Thread(target=self._run, name='micro-batch-encoder', daemon=True).start()
+                self._worker_pid = os.getpid()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            try:
+                with self._busy:
+                    embeddings = self.model.encode([text for text, _ in batch])
+                for (_, future), embedding in zip(batch, embeddings):
+                    future.set_result(embedding)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+
 # Initialize the recommendation engine
 engine = None
+_engine_lock = threading.Lock()
+
+@functools.cache
+def _resolve_paths():
+    """Resolve the app directory and config path once."""
+    # Get the directory where app.py is located
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return current_dir, os.path.join(current_dir, 'config.yml')
 
 def get_engine():
     """Lazy initialization of the recommendation engine."""
     global engine
-    if engine is None:
+    if engine is not None:
+        return engine
+
+    # Double-checked so concurrent first requests in threaded workers build one engine
+    with _engine_lock:
+        if engine is not None:
+            return engine
         try:
-            # Get the directory where app.py is located
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            config_path = os.path.join(current_dir, 'config.yml')
+            current_dir, config_path = _resolve_paths()
             logger.info(f"Current working directory: {os.getcwd()}")
             logger.info(f"App directory: {current_dir}")
             logger.info(f"Config path: {config_path}")
             logger.info(f"Config exists: {os.path.exists(config_path)}")
-            engine = InternshipRecommendationEngine(config_path=config_path)
+            new_engine = InternshipRecommendationEngine(config_path=config_path)
+
+            # Batch profile encodes from concurrent requests (threaded workers)
+            api_config = new_engine.config.get('api', {})
+            new_engine.model = MicroBatchEncoder(
+                new_engine.model,
+                max_batch_size=api_config.get('micro_batch_size', 32),
+                max_wait_ms=api_config.get('micro_batch_wait_ms', 5)
+            )
+            # Publish only once fully set up so lock-free readers never see a partial engine
+            engine = new_engine
             logger.info("Recommendation engine initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize recommendation engine: {e}")
@@ -206,13 +327,27 @@ def main():
 
     api_config = config.get('api', {})
 
-    logger.info(f"Starting Flask app on {api_config.get('host', '0.0.0.0')}:{api_config.get('port', 8000)}")
+    host = api_config.get('host', '0.0.0.0')
+    port = api_config.get('port', 8000)
 
-    app.run(
-        host=api_config.get('host', '0.0.0.0'),
-        port=api_config.get('port', 8000),
-        debug=api_config.get('debug', True)
-    )
+    try:
+        import gunicorn  # noqa: F401 - only used to check availability
+    except ImportError:
+        # gunicorn is POSIX-only; fall back to the Flask development server
+        logger.warning("gunicorn not installed, using the Flask development server")
+        logger.info(f"Starting Flask app on {host}:{port}")
+        app.run(host=host, port=port, debug=api_config.get('debug', True), threaded=True)
+        return
+
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+    logger.info(f"Starting gunicorn on {host}:{port}")
+    os.execvp(sys.executable, [
+        sys.executable, '-m', 'gunicorn',
+        '-c', os.path.join(app_dir, 'gunicorn.conf.py'),
+        '--chdir', app_dir,
+        '-b', f"{host}:{port}",
+        'app:app'
+    ])
 
 if __name__ == '__main__':
     main()
@@ -8,21 +8,30 @@ for fast nearest-neighbor retrieval.
 
 import pandas as pd
 import numpy as np
-import pickle
 import yaml
 import os
 from sentence_transformers import SentenceTransformer
+import torch
 import faiss
+from onnx_encoder import ONNX_SUBDIR, export_quantized_onnx
+from recommendation_engine import add_normalized_columns
 from typing import List, Dict, Any
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Index building is a one-off batch job, so let torch use every available core
+torch.set_num_threads(os.cpu_count() or 1)
+
 class InternshipIndexer:
-    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2', batch_size: int = 1024,
+                 device: str = None):
         """Initialize the indexer with a sentence transformer model."""
-        self.model = SentenceTransformer(model_name)
+        # device=None lets sentence-transformers pick CUDA when it is available
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name, device=device)
+        self.batch_size = batch_size
         self.embeddings = None
         self.index = None
         self.internships_df = None
@@ -39,88 +48,125 @@ class InternshipIndexer:
         logger.info(f"Loaded {len(df)} internships")
         return df
 
-    def create_internship_text(self, row: pd.Series) -> str:
-        """Create a comprehensive text representation for embedding."""
-        text_parts = []
+    def _build_texts_vectorized(self, df: pd.DataFrame) -> pd.Series:
+        """Create comprehensive text representations for all internships in one pass."""
+        def column(name: str) -> pd.Series:
+            if name in df.columns:
+                return df[name]
+            return pd.Series(np.nan, index=df.index, dtype=object)
+
+        def append(texts: pd.Series, fragment: pd.Series, mask: pd.Series) -> pd.Series:
+            return texts.where(~mask, texts + '. ' + fragment)
 
         # Title and organization
-        text_parts.append(f"{row.get('title', '')} at {row.get('organization', '')}")
+        texts = (column('title').fillna('').astype(str) + ' at ' +
+                 column('organization').fillna('').astype(str))
 
         # Preferred skills (most important for matching)
-        if pd.notna(row.get('preferred_skills')):
-            text_parts.append(f"Preferred skills: {row['preferred_skills']}")
+        skills = column('preferred_skills')
+        texts = append(texts, 'Preferred skills: ' + skills.astype(str), skills.notna())
 
         # Required qualifications
-        if pd.notna(row.get('required_qualifications')):
-            text_parts.append(f"Required qualifications: {row['required_qualifications']}")
+        quals = column('required_qualifications')
+        texts = append(texts, 'Required qualifications: ' + quals.astype(str), quals.notna())
 
         # Sector tags
-        if pd.notna(row.get('sector_tags')):
-            text_parts.append(f"Sectors: {row['sector_tags']}")
-
-        # Core description (shortened)
-        if pd.notna(row.get('description')):
-            # Take first sentence or first 100 characters
-            desc = row['description']
-            if len(desc) > 100:
-                desc = desc[:100] + "..."
-            text_parts.append(desc)
-
-        # Responsibilities (if different from description)
-        if pd.notna(row.get('responsibilities')):
-            resp = row['responsibilities']
-            if len(resp) > 50:
-                resp = resp[:50] + "..."
-            text_parts.append(f"Responsibilities: {resp}")
+        sectors = column('sector_tags')
+        texts = append(texts, 'Sectors: ' + sectors.astype(str), sectors.notna())
+
+        # Core description (shortened to first 100 characters)
+        description = column('description')
+        desc = description.fillna('').astype(str)
+        desc = desc.where(desc.str.len() <= 100, desc.str.slice(0, 100) + '...')
+        texts = append(texts, desc, description.notna())
+
+        # Responsibilities (shortened to first 50 characters)
+        responsibilities = column('responsibilities')
+        resp = responsibilities.fillna('').astype(str)
+        resp = resp.where(resp.str.len() <= 50, resp.str.slice(0, 50) + '...')
+        texts = append(texts, 'Responsibilities: ' + resp, responsibilities.notna())
 
         # Location information (prioritize city and state)
-        location_parts = []
-        if pd.notna(row.get('location_city')):
-            location_parts.append(row['location_city'])
-        if pd.notna(row.get('location_state')):
-            location_parts.append(row['location_state'])
-        if location_parts:
-            text_parts.append(f"Location: {', '.join(location_parts)}")
+        city, state = column('location_city'), column('location_state')
+        has_city, has_state = city.notna(), state.notna()
+        location = city.astype(str).where(has_city, '')
+        location = location.where(~has_state,
+                                  location.where(~has_city, location + ', ') + state.astype(str))
+        texts = append(texts, 'Location: ' + location, has_city | has_state)
 
         # Remote work info
-        if row.get('remote_allowed') == 'yes':
-            text_parts.append("Remote work allowed")
+        texts = append(texts, pd.Series('Remote work allowed', index=df.index),
+                       column('remote_allowed') == 'yes')
 
         # Duration and stipend
-        duration_info = []
-        if pd.notna(row.get('duration_weeks')):
-            duration_info.append(f"Duration: {row['duration_weeks']} weeks")
-        if pd.notna(row.get('stipend')) and row['stipend'] != '0':
-            duration_info.append(f"Stipend: {row['stipend']}")
-        if duration_info:
-            text_parts.append('. '.join(duration_info))
+        duration = column('duration_weeks')
+        texts = append(texts, 'Duration: ' + duration.astype(str) + ' weeks', duration.notna())
+        stipend = column('stipend')
+        texts = append(texts, 'Stipend: ' + stipend.astype(str), stipend.notna() & (stipend != '0'))
 
-        return '. '.join(text_parts)
+        return texts
 
     def create_embeddings(self, df: pd.DataFrame) -> np.ndarray:
         """Create embeddings for all internships."""
         logger.info("Creating embeddings for internships...")
 
-        texts = []
-        for _, row in df.iterrows():
-            text = self.create_internship_text(row)
-            texts.append(text)
-
-        embeddings = self.model.encode(texts, show_progress_bar=True)
+        texts = self._build_texts_vectorized(df).tolist()
+
+        # encode() sorts texts by length before batching, so a large batch size
+        # keeps padding waste low while amortizing per-batch overhead
+        embeddings = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            show_progress_bar=True,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
         logger.info(f"Created embeddings with shape: {embeddings.shape}")
 
         return embeddings
 
-    def build_faiss_index(self, embeddings: np.ndarray, index_type: str = 'IndexIVFFlat'):
+    def build_faiss_index(self, embeddings: np.ndarray, index_type: str = 'IndexHNSWSQ'):
         """Build FAISS index for fast retrieval."""
         logger.info("Building FAISS index...")
 
         dimension = embeddings.shape[1]
-        nlist = min(100, len(embeddings) // 39)  # Number of clusters
 
-        if index_type == 'IndexIVFFlat':
+        # Unit-normalize so inner product equals cosine similarity
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        faiss.normalize_L2(embeddings)
+
+        # Product quantization needs enough vectors to train 256 centroids per sub-quantizer
+        if index_type in ('IndexHNSWPQ', 'IndexIVFPQ') and len(embeddings) < 256 * 39:
+            logger.warning("Too few vectors to train PQ, using fp16 scalar quantization instead")
+            index_type = 'IndexHNSWSQ'
+
+        if index_type == 'IndexHNSWSQ':
+            # fp16 vectors halve index memory and bandwidth with negligible recall loss
+            index = faiss.IndexHNSWSQ(dimension, faiss.ScalarQuantizer.QT_fp16, 32,
+                                      faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = 200
+        elif index_type == 'IndexHNSWSQ8':
+            # int8 vectors: a quarter of fp32 memory; the quantizer trains per-dimension ranges
+            index = faiss.IndexHNSWSQ(dimension, faiss.ScalarQuantizer.QT_8bit, 32,
+                                      faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = 200
+        elif index_type == 'IndexIVFPQ':
+            # Large corpora: sqrt(N) coarse clusters, 8-bit codes over d/8-dim sub-vectors
+            nlist = int(np.sqrt(len(embeddings)))
+            quantizer = faiss.IndexFlatIP(dimension)
+            index = faiss.IndexIVFPQ(quantizer, dimension, nlist, dimension // 8, 8, faiss.METRIC_INNER_PRODUCT)
+        elif index_type == 'IndexHNSWPQ':
+            # 48 x 8-bit sub-quantizers: ~32x smaller than fp32 for 384-d vectors
+            index = faiss.IndexHNSWPQ(dimension, 48, 32, 8, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = 200
+        elif index_type == 'IndexHNSWFlat':
+            # Graph index: no training step, sub-millisecond single-query search
+            index = faiss.IndexHNSWFlat(dimension, 32, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = 200
+        elif index_type == 'IndexIVFFlat':
+            nlist = max(1, min(100, len(embeddings) // 39))  # Number of clusters
             quantizer = faiss.IndexFlatIP(dimension)  # Inner product (cosine similarity)
-            index = faiss.IndexIVFFlat(quantizer, dimension, nlist)
+            index = faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss.METRIC_INNER_PRODUCT)
         else:
             # Fallback to flat index for small datasets
             index = faiss.IndexFlatIP(dimension)
@@ -140,15 +186,23 @@ class InternshipIndexer:
         # Save FAISS index
         faiss.write_index(self.index, os.path.join(output_dir, 'internship_index.faiss'))
 
-        # Save embeddings
-        with open(os.path.join(output_dir, 'internship_embeddings.pkl'), 'wb') as f:
-            pickle.dump(self.embeddings, f)
+        # Save embeddings as a C-contiguous .npy so they can be memory-mapped
+        np.save(os.path.join(output_dir, 'internship_embeddings.npy'),
+                np.ascontiguousarray(self.embeddings, dtype=np.float32))
 
-        # Save internship data
-        self.internships_df.to_pickle(os.path.join(output_dir, 'internships.pkl'))
+        # Save internship data as columnar parquet (readable column-by-column)
+        self.internships_df.to_parquet(os.path.join(output_dir, 'internships.parquet'),
+                                       compression='zstd')
 
         logger.info(f"Saved index and data to {output_dir}")
 
+    def export_onnx_encoder(self, output_dir: str = 'models'):
+        """Export an int8-quantized ONNX copy of the encoder for low-latency serving."""
+        try:
+            export_quantized_onnx(self.model_name, os.path.join(output_dir, ONNX_SUBDIR))
+        except ImportError as e:
+            logger.warning(f"Skipping ONNX export, optimum/onnxruntime not installed: {e}")
+
     def build_and_save(self, csv_path: str, output_dir: str = 'models'):
         """Main method to build and save the index."""
         # Load data
@@ -160,9 +214,15 @@ class InternshipIndexer:
         # Build FAISS index
         self.index = self.build_faiss_index(self.embeddings)
 
+        # Store lowercase tokens and locations so serving never re-normalizes strings
+        self.internships_df = add_normalized_columns(self.internships_df)
+
         # Save everything
         self.save_index(output_dir)
 
+        # Export the quantized query encoder used by the recommendation engine
+        self.export_onnx_encoder(output_dir)
+
         return self.index, self.embeddings, self.internships_df
 
 def main():
@@ -1,32 +1,40 @@
 import pandas as pd
 import json
-from collections import Counter
 
 # Read the CSV file
 df = pd.read_csv('Module-B ML\internships.csv')
 
+
+def count_tokens(column: pd.Series) -> pd.Series:
+    """Count comma-separated tokens in a column with vectorized string ops."""
+    return column.dropna().str.split(',').explode().str.strip().value_counts()
+
+
 # Extract skills with counts
-skills_counter = Counter()
-for skill_str in df['preferred_skills'].dropna():
-    skills_list = [s.strip() for s in skill_str.split(',')]
-    skills_counter.update(skills_list)
+skills_counter = count_tokens(df['preferred_skills'])
 
 # Extract locations with counts (cities and states)
-cities_counter = Counter(df['location_city'].dropna())
-states_counter = Counter(df['location_state'].dropna())
-locations_counter = cities_counter + states_counter
+locations_counter = pd.concat([df['location_city'], df['location_state']]).dropna().value_counts()
 
 # Extract sectors with counts
-sectors_counter = Counter()
-for sector_str in df['sector_tags'].dropna():
-    sectors_list = [s.strip() for s in sector_str.split(',')]
-    sectors_counter.update(sectors_list)
+sectors_counter = count_tokens(df['sector_tags'])
+
+
+def to_records(counts: pd.Series) -> list:
+    """Convert counts to name-sorted records."""
+    return [{'name': name, 'count': int(count)} for name, count in counts.sort_index().items()]
+
+
+def top_items(counts: pd.Series, n: int = 10) -> pd.Series:
+    """Most common items, ties kept in order of first appearance."""
+    return counts.sort_values(ascending=False, kind='stable').head(n)
+
 
 # Create data structure with counts
 data = {
-    'skills': [{'name': skill, 'count': count} for skill, count in sorted(skills_counter.items())],
-    'locations': [{'name': location, 'count': count} for location, count in sorted(locations_counter.items())],
-    'sectors': [{'name': sector, 'count': count} for sector, count in sorted(sectors_counter.items())]
+    'skills': to_records(skills_counter),
+    'locations': to_records(locations_counter),
+    'sectors': to_records(sectors_counter)
 }
 
 # Save to JSON file
@@ -40,13 +48,13 @@ print(f'Sectors: {len(data["sectors"])}')
 
 # Print top 10 most common items in each category
 print('\nTop 10 Skills:')
-for item in sorted(skills_counter.items(), key=lambda x: x[1], reverse=True)[:10]:
-    print(f'  {item[0]}: {item[1]}')
+for name, count in top_items(skills_counter).items():
+    print(f'  {name}: {count}')
 
 print('\nTop 10 Locations:')
-for item in sorted(locations_counter.items(), key=lambda x: x[1], reverse=True)[:10]:
-    print(f'  {item[0]}: {item[1]}')
+for name, count in top_items(locations_counter).items():
+    print(f'  {name}: {count}')
 
 print('\nTop 10 Sectors:')
-for item in sorted(sectors_counter.items(), key=lambda x: x[1], reverse=True)[:10]:
-    print(f'  {item[0]}: {item[1]}')
+for name, count in top_items(sectors_counter).items():
+    print(f'  {name}: {count}')
@@ -0,0 +1,44 @@
+"""
+Gunicorn settings for the Internship Recommendation API
+
+Usage: gunicorn -c gunicorn.conf.py app:app
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# /recommend is CPU-bound (embedding + reranking), so use one worker per core
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+
+# Threads per worker; >1 switches to gthread so concurrent requests can share
+# batched profile encodes (see MicroBatchEncoder in app.py). With sync workers
+# (GUNICORN_THREADS=1) each worker serves one request at a time and nothing is batched.
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+# Import the app in the master; when_ready then loads the engine there for workers to share
+preload_app = True
+
+# Model loading on cold start can take a while
+timeout = 120
+
+
+def when_ready(server):
+    """Load the engine in the master before workers fork so they inherit it copy-on-write."""
+    from app import get_engine
+    get_engine()
+
+
+def post_fork(server, worker):
+    """Limit each worker to one torch thread so workers x threads does not exceed cores.
+
+    The ONNX encoder builds its session in each worker on first encode, with the
+    onnx_intra_op_threads setting from config.yml (1 by default).
+    """
+    try:
+        import torch
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
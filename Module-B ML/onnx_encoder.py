@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+ONNX Runtime Sentence Encoder
+
+Exports the sentence transformer to an int8-quantized ONNX model at build time and
+provides a lightweight, SentenceTransformer-compatible encoder for serving.
+"""
+
+import os
+import threading
+import numpy as np
+from typing import List, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+ONNX_SUBDIR = 'onnx'
+ONNX_MODEL_FILE = 'model_quantized.onnx'
+
+
+def _hub_model_id(model_name: str) -> str:
+    """Resolve short sentence-transformers names to their Hugging Face hub id."""
+    if '/' in model_name or os.path.isdir(model_name):
+        return model_name
+    return f'sentence-transformers/{model_name}'
+
+
+def export_quantized_onnx(model_name: str, output_dir: str) -> str:
+    """Export the model to ONNX and apply dynamic int8 quantization."""
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    os.makedirs(output_dir, exist_ok=True)
+    model_id = _hub_model_id(model_name)
+
+    logger.info(f"Exporting {model_id} to ONNX in {output_dir}")
+    model = ORTModelForFeatureExtraction.from_pretrained(model_id, export=True)
+    model.save_pretrained(output_dir)
+    AutoTokenizer.from_pretrained(model_id).save_pretrained(output_dir)
+
+    # Dynamic quantization needs no calibration data and keeps activations in fp32
+    quantizer = ORTQuantizer.from_pretrained(model)
+    quantization_config = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+    quantizer.quantize(save_dir=output_dir, quantization_config=quantization_config)
+
+    logger.info(f"Saved quantized ONNX model to {output_dir}")
+    return os.path.join(output_dir, ONNX_MODEL_FILE)
+
+
+class OnnxSentenceEncoder:
+    def __init__(self, model_dir: str, model_file: str = ONNX_MODEL_FILE, max_length: int = 256,
+                 intra_op_num_threads: int = 1):
+        """Load the tokenizer for a quantized sentence transformer; the ONNX Runtime session is
+        created on first use in each process.
+
+        intra_op_num_threads caps the threads one encode uses (0 lets ONNX Runtime use every
+        physical core). The default of 1 suits one server worker per core.
+        """
+        import onnxruntime  # noqa: F401 - fail here, not on first encode, so callers can fall back
+        from transformers import AutoConfig, AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        # Mean pooling keeps the transformer's hidden size as the embedding dimension
+        self.embedding_dim = AutoConfig.from_pretrained(model_dir).hidden_size
+        self.model_path = os.path.join(model_dir, model_file)
+        self.max_length = max_length
+        self.intra_op_num_threads = intra_op_num_threads
+        # ONNX Runtime thread pools do not survive a fork, so a session built in a preloading
+        # server master must not be shared with its workers
+        self._session = None
+        self._session_pid = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """ONNX Runtime session owned by the current process."""
+        if self._session_pid != os.getpid():
+            # Threaded workers may hit the first encode concurrently; build one session
+            with self._session_lock:
+                if self._session_pid == os.getpid():
+                    return self._session
+                import onnxruntime as ort
+
+                session_options = ort.SessionOptions()
+                session_options.intra_op_num_threads = self.intra_op_num_threads
+                session_options.inter_op_num_threads = 1  # The exported graph is a single sequential chain
+                session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                self._session = ort.InferenceSession(
+                    self.model_path,
+                    sess_options=session_options,
+                    providers=['CPUExecutionProvider']
+                )
+                self.input_names = {model_input.name for model_input in self._session.get_inputs()}
+                self._session_pid = os.getpid()
+        return self._session
+
+    def encode(self, texts: Union[str, List[str]], batch_size: int = 32, **kwargs) -> np.ndarray:
+        """Encode texts into L2-normalized, mean-pooled sentence embeddings."""
+        single_text = isinstance(texts, str)
+        if single_text:
+            texts = [texts]
+        if not texts:
+            return np.empty((0, self.embedding_dim), dtype=np.float32)
+
+        # Encode in length order so each sub-batch pads to similar lengths, as SentenceTransformer does
+        order = np.argsort([-len(text) for text in texts], kind='stable')
+        sorted_texts = [texts[i] for i in order]
+
+        session = self.session
+        batches = []
+        for start in range(0, len(sorted_texts), batch_size):
+            tokens = self.tokenizer(
+                sorted_texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors='np'
+            )
+            feeds = {name: value.astype(np.int64) for name, value in tokens.items()
+                     if name in self.input_names}
+            token_embeddings = session.run(None, feeds)[0]
+
+            # Mean pooling over non-padding tokens, then L2 normalization
+            mask = tokens['attention_mask'][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            batches.append(pooled.astype(np.float32))
+
+        embeddings = np.empty((len(texts), batches[0].shape[1]), dtype=np.float32)
+        embeddings[order] = np.vstack(batches)
+        return embeddings[0] if single_text else embeddings
@@ -7,20 +7,311 @@ This module provides content-based recommendations using embeddings and rule-bas
 
 import pandas as pd
 import numpy as np
-import pickle
 import yaml
 import os
 from sentence_transformers import SentenceTransformer
 import faiss
+import ahocorasick
+import pyarrow.parquet as pq
+from scipy import sparse
+from onnx_encoder import ONNX_SUBDIR, ONNX_MODEL_FILE, OnnxSentenceEncoder
 from typing import List, Dict, Any, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import logging
 import re
-from difflib import SequenceMatcher
+import tempfile
+import hashlib
+import json
+import functools
+import bisect
+import heapq
+import operator
+from collections import defaultdict
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from rapidfuzz import fuzz, process
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Domain-aligned skill match scores persisted next to the index between restarts
+SKILL_MATCH_MATRIX_FILE = 'skill_match_matrix.npz'
+# Bump when the skill matching rules in code change so persisted matrices are rebuilt
+_SKILL_MATRIX_FORMAT_VERSION = 1
+
+# Internship columns read by scoring, explanations and the response payload
+SERVING_COLUMNS = [
+    'internship_id', 'title', 'organization', 'sector_tags', 'description',
+    'preferred_skills', 'stipend', 'location_city', 'location_district', 'location_state',
+    'remote_allowed', 'duration_weeks', 'application_deadline', 'eligibility_min_qualification',
+    'experience_required', 'url', 'posted_date',
+    'preferred_skills_tokens', 'sector_tags_tokens',
+    'location_city_lower', 'location_district_lower', 'location_state_lower',
+    'sector_tags_lower', 'preferred_skills_lower', 'organization_lower', 'eligibility_min_qualification_lower'
+]
+
+# Raw columns that get a lowercase '<column>_lower' sibling at build time
+LOWERCASE_COLUMNS = [
+    'location_city', 'location_district', 'location_state',
+    'sector_tags', 'preferred_skills', 'organization', 'eligibility_min_qualification'
+]
+
+# Design tool categories and the skill spellings that map to them
+DESIGN_TOOLS = {
+    'photoshop': ('photoshop', 'adobe photoshop', 'ps', 'photoshop cc'),
+    'figma': ('figma', 'figma design', 'ui design'),
+    'illustrator': ('illustrator', 'adobe illustrator', 'ai'),
+    'premiere': ('premiere', 'premiere pro', 'adobe premiere'),
+    'after effects': ('after effects', 'ae', 'motion graphics'),
+    'indesign': ('indesign', 'adobe indesign'),
+    'sketch': ('sketch', 'sketch app'),
+    'xd': ('xd', 'adobe xd', 'experience design'),
+    'canva': ('canva', 'canva design'),
+    'video editing': ('video editing', 'video production', 'editing', 'post production')
+}
+_VARIATION_TO_TOOL = {var: tool for tool, variations in DESIGN_TOOLS.items() for var in variations}
+_GENERAL_DESIGN_TERMS = ('design', 'creative', 'graphic', 'ui', 'ux')
+
+
+@functools.lru_cache(maxsize=8192)
+def _parse_stipend_range_cached(stipend_str: str) -> Optional[Tuple[int, int]]:
+    """Parse a stipend string into a (min, max) range; the dataset has few distinct values."""
+    if stipend_str == '0' or stipend_str.strip() == '':
+        return None
+
+    # Handle ranges like "5000-8000"
+    if '-' in stipend_str:
+        parts = stipend_str.split('-')
+        try:
+            min_val = int(parts[0].strip())
+            max_val = int(parts[1].strip())
+            return (min_val, max_val)
+        except ValueError:
+            return None
+
+    # Handle single values
+    try:
+        value = int(stipend_str.strip())
+        return (value, value)
+    except ValueError:
+        return None
+
+
+@functools.lru_cache(maxsize=8192)
+def _days_since_posted(posted_date: str, today: str) -> Optional[int]:
+    """Whole days between a YYYY-MM-DD posting date and an ISO date (None if unparseable)."""
+    try:
+        posted = datetime.strptime(posted_date, '%Y-%m-%d').date()
+    except ValueError:
+        return None
+    return (date.fromisoformat(today) - posted).days
+
+# Match reason labels, keyed by scorer reason codes or by exact component scores
+_QUALIFICATION_REASON_LABELS = {
+    'exact_match': 'exact match',
+    'higher_qualification': 'higher qualification',
+    'lower_qualification': 'lower qualification',
+    'underqualified': 'underqualified',
+    'overqualified': 'overqualified'
+}
+_QUALIFICATION_FIT_LABELS = {0.3: 'basic fit', 0.8: 'good fit', 1.0: 'perfect fit'}
+_EXPERIENCE_REASON_LABELS = {
+    'beginner_friendly': 'beginner friendly',
+    'experience_match': 'experience level matches',
+    'more_experienced': 'more experienced than required',
+    'less_experienced': 'less experienced (learning opportunity)'
+}
+_LOCATION_MATCH_LABELS = {
+    0.3: 'different state',
+    0.7: 'same state',
+    0.9: 'same district',
+    1.0: 'same city',
+    0.8: 'remote available',
+    0.6: 'remote option available',
+    0.4: 'flexible remote work'
+}
+
+# Explanation lines by score tier: the first (threshold, template) the score reaches is used
+_QUALIFICATION_EXPLANATIONS = (
+    (0.8, "- Your {candidate_qual} qualification is an excellent match for this position"),
+    (0.3, "- Your {candidate_qual} qualification meets the requirements (position requires {required_qual})"),
+    (float('-inf'), "- Your {candidate_qual} qualification is compatible with this {required_qual} position"),
+)
+_LOCATION_EXPLANATIONS = (
+    (0.9, "- The location ({city}) perfectly matches your preferences"),
+    (0.7, "- The location is in {state}, which aligns with your preferences"),
+    (0.4, "- Remote work options make this accessible from your location"),
+)
+
+
+def _tier_template(tiers: Tuple[Tuple[float, str], ...], score: float) -> Optional[str]:
+    """Template of the first tier whose threshold the score reaches, or None."""
+    return next((template for threshold, template in tiers if score >= threshold), None)
+
+# Overall score lower bounds of the Fair/Good/Very Good/Excellent recommendation strengths
+_STRENGTH_BOUNDS = (0.2, 0.4, 0.6, 0.8)
+_STRENGTH_LABELS = ('Low', 'Fair', 'Good', 'Very Good', 'Excellent')
+
+# Weighted components of the combined score, in the order they are summed
+SCORE_COMPONENTS = ('embedding_similarity', 'skill_overlap', 'qualification_fit', 'experience_compatibility',
+                    'location_match', 'sector_relevance', 'stipend_match', 'recency', 'diversity_bonus')
+
+# Years-of-experience upper bounds of the beginner/intermediate/advanced levels (expert above)
+_EXPERIENCE_BOUNDS = np.array([1, 3, 5])
+_EXPERIENCE_LEVEL_NAMES = ('beginner', 'intermediate', 'advanced', 'expert')
+
+# Experience requirement wording, checked in priority order (beginner wording wins over later levels)
+_EXPERIENCE_REQUIREMENT_PATTERNS = (
+    ('beginner', re.compile(r'fresher|beginner|entry|no experience')),
+    ('intermediate', re.compile(r'1-3|intermediate|some experience')),
+    ('advanced', re.compile(r'3-5|advanced|experienced')),
+)
+
+
+def build_automaton(patterns) -> Optional['ahocorasick.Automaton']:
+    """Aho-Corasick automaton over the non-empty patterns (None if there are none)."""
+    automaton = ahocorasick.Automaton()
+    for pattern in patterns:
+        if pattern:
+            automaton.add_word(pattern, pattern)
+    if not len(automaton):
+        return None
+    automaton.make_automaton()
+    return automaton
+
+
+def find_patterns(automaton: Optional['ahocorasick.Automaton'], text: str) -> set:
+    """All automaton patterns occurring in text, found in a single scan."""
+    if automaton is None:
+        return set()
+    return {pattern for _, pattern in automaton.iter(text)}
+
+
+def contains_any(automaton: Optional['ahocorasick.Automaton'], text: str) -> bool:
+    """Whether any automaton pattern occurs in text, stopping at the first hit."""
+    return automaton is not None and next(automaton.iter(text), None) is not None
+
+
+def tokenize_comma_separated(column: pd.Series) -> pd.Series:
+    """Split a comma-separated column into lowercase, stripped token lists ([] for missing)."""
+    tokens = column.dropna().astype(str).str.lower().str.strip().str.split(r'\s*,\s*', regex=True)
+    return tokens.reindex(column.index).apply(lambda t: t if isinstance(t, list) else [])
+
+
+def add_normalized_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Add lowercase skill/sector token lists and lowercase copies of the matched text columns.
+
+    Run by build_index.py so the serving artifact already carries normalized strings.
+    """
+    df['preferred_skills_tokens'] = tokenize_comma_separated(df['preferred_skills'])
+    df['sector_tags_tokens'] = tokenize_comma_separated(df['sector_tags'])
+    for column in LOWERCASE_COLUMNS:
+        values = df[column] if column in df.columns else pd.Series('', index=df.index)
+        df[f'{column}_lower'] = values.fillna('').astype(str).str.lower()
+    return df
+
+class InternshipRow(Mapping):
+    """Read-only view of one internship row over the engine's column arrays.
+
+    Fields are looked up on access, so building a row costs nothing however many columns
+    the dataset has; scorers and explanations only touch a handful of them.
+    """
+
+    __slots__ = ('_cols', '_position')
+
+    def __init__(self, cols: Dict[str, np.ndarray], position: int):
+        self._cols = cols
+        self._position = position
+
+    def __getitem__(self, column: str) -> Any:
+        return self._cols[column][self._position]
+
+    def __iter__(self):
+        return iter(self._cols)
+
+    def __len__(self) -> int:
+        return len(self._cols)
+
+
+class DiversityTracker:
+    """Running sector/location/organization counts and stipend ranges of the recommendations picked so far.
+
+    Well-formed stipend ranges are also kept as sorted bounds, so counting the ranges a new
+    internship overlaps is two binary searches instead of a scan over every earlier pick.
+    """
+
+    def __init__(self, engine: 'InternshipRecommendationEngine', capacity: int):
+        self.engine = engine
+
+        # Config values and row arrays read for every scored internship, looked up once
+        diversity_config = engine.config['diversity']
+        self.full_bonus = engine.config['scoring_weights']['diversity_bonus']
+        self.caps = [(engine._diversity_key_ids[key], diversity_config[cap], diversity_config[weight], key)
+                     for key, cap, weight in (('sector', 'max_same_sector', 'sector_diversity_weight'),
+                                              ('location', 'max_same_location', 'location_diversity_weight'),
+                                              ('organization', 'max_same_org', 'organization_diversity_weight'))]
+        self.stipend_penalty = diversity_config['stipend_range_diversity']
+        self.row_stipend_low, self.row_stipend_high = engine._stipend_low, engine._stipend_high
+
+        self.counts = {key: np.zeros(ids.max(initial=-1) + 1, dtype=np.int32)
+                       for key, ids in engine._diversity_key_ids.items()}
+        self.stipend_low = np.empty(capacity, dtype=np.float64)
+        self.stipend_high = np.empty(capacity, dtype=np.float64)
+        self.sorted_lows = []
+        self.sorted_highs = []
+        self.inverted_ranges = []  # (low, high) ranges with low > high, checked one by one
+        self.size = 0
+        self.n_stipends = 0
+
+    def add(self, position: int):
+        """Record the internship at a row position as recommended."""
+        for key, ids in self.engine._diversity_key_ids.items():
+            self.counts[key][ids[position]] += 1
+        if self.engine._stipend_present[position]:
+            low, high = self.engine._stipend_low[position], self.engine._stipend_high[position]
+            self.stipend_low[self.n_stipends] = low
+            self.stipend_high[self.n_stipends] = high
+            self.n_stipends += 1
+            if low <= high:
+                bisect.insort(self.sorted_lows, low)
+                bisect.insort(self.sorted_highs, high)
+            elif not np.isnan(low):
+                self.inverted_ranges.append((low, high))
+        self.size += 1
+
+    def count_stipend_overlaps(self, low: float, high: float) -> int:
+        """Number of recorded stipend ranges overlapping [low, high]."""
+        if low > high:
+            return int(np.count_nonzero((low <= self.stipend_high[:self.n_stipends]) &
+                                        (high >= self.stipend_low[:self.n_stipends])))
+
+        # Ranges starting at or below high, minus those (all starting below low) ending before low
+        overlaps = bisect.bisect_right(self.sorted_lows, high) - bisect.bisect_left(self.sorted_highs, low)
+        return overlaps + sum(1 for other_low, other_high in self.inverted_ranges
+                              if low <= other_high and high >= other_low)
+
+    def diversity_score(self, position: int) -> float:
+        """calculate_diversity_score for a row position against the recorded recommendations."""
+        if not self.size:
+            return self.full_bonus  # Full bonus for first recommendation
+
+        # Calculate diversity penalties (sector, location, organization caps)
+        diversity_penalty = 0.0
+        for ids, cap, weight, key in self.caps:
+            if self.counts[key][ids[position]] >= cap:
+                diversity_penalty += weight
+
+        # Stipend range diversity (encourage variety in compensation); unparsed ranges never overlap
+        low, high = self.row_stipend_low[position], self.row_stipend_high[position]
+        if not np.isnan(low) and self.n_stipends:
+            if self.count_stipend_overlaps(low, high) / self.n_stipends > 0.7:  # Too similar stipends
+                diversity_penalty += self.stipend_penalty
+
+        # Return diversity bonus (inverse of penalty)
+        diversity_score = self.full_bonus - diversity_penalty
+        return diversity_score if diversity_score > 0 else 0
+
+
 class InternshipRecommendationEngine:
     def __init__(self, config_path: str = 'config.yml', model_dir: str = 'models'):
         """Initialize the recommendation engine."""
@@ -31,12 +322,36 @@ class InternshipRecommendationEngine:
             logger.warning(f"Config file {config_path} not found, using default settings")
             self.config = self._get_default_config()
 
+        # Inverted skill taxonomy for O(1) skill -> domain lookups (first domain wins)
+        self._skill_to_domain = {}
+        for domain, skills in self.config.get('skill_taxonomy', {}).get('domains', {}).items():
+            for skill in skills:
+                self._skill_to_domain.setdefault(skill.lower(), domain)
+
+        # Skill -> domain lookups repeat for the same skills across every ranked internship
+        self.get_skill_domain = functools.lru_cache(maxsize=8192)(self.get_skill_domain)
+
         self.model_dir = model_dir
         self.model = None
         self.index = None
         self.embeddings = None
         self.internships_df = None
 
+        # In-process LRU of candidate profile embeddings keyed by profile text
+        cache_config = self.config.get('profile_embedding_cache', {})
+        self._embed_profile_text = functools.lru_cache(maxsize=cache_config.get('max_size', 4096))(
+            self._encode_profile_text
+        )
+        # Skill-vs-vocabulary match rows for the candidate skills of recent requests
+        self._candidate_skill_rows = functools.lru_cache(maxsize=1024)(self._build_candidate_skill_rows)
+        # Base scoring weights as floats for the per-recommendation scoring breakdown
+        self._breakdown_weights = {k: float(v) for k, v in self.config['scoring_weights'].items()}
+        # Domain-aligned skill scores per (candidate skills, internship id), reused across re-ranks
+        skill_cache_size = self.config.get('skill_score_cache', {}).get('max_size', 100000)
+        self._internship_skill_score = functools.lru_cache(maxsize=skill_cache_size)(self._score_internship_skills)
+        # Explanation skill matches per (candidate skills, internship id)
+        self._internship_matched_skills = functools.lru_cache(maxsize=skill_cache_size)(self._match_internship_skills)
+
         self._load_model_and_index()
 
     def _get_default_config(self):
@@ -112,34 +427,323 @@ class InternshipRecommendationEngine:
 
         logger.info(f"Using model directory: {self.model_dir}")
 
-        # Load sentence transformer model
-        model_name = self.config['embedding_model']
-        self.model = SentenceTransformer(model_name)
+        # Load sentence transformer model, preferring the quantized ONNX export
+        self.model = self._load_encoder()
 
         # Load FAISS index
         index_path = os.path.join(self.model_dir, 'internship_index.faiss')
         logger.info(f"Loading FAISS index from: {index_path}")
         if not os.path.exists(index_path):
             raise FileNotFoundError(f"FAISS index file not found: {index_path}")
-        self.index = faiss.read_index(index_path)
-
-        # Load embeddings
-        embeddings_path = os.path.join(self.model_dir, 'internship_embeddings.pkl')
-        logger.info(f"Loading embeddings from: {embeddings_path}")
-        if not os.path.exists(embeddings_path):
-            raise FileNotFoundError(f"Embeddings file not found: {embeddings_path}")
-        with open(embeddings_path, 'rb') as f:
-            self.embeddings = pickle.load(f)
-
-        # Load internships data
-        internships_path = os.path.join(self.model_dir, 'internships.pkl')
+        # Map the stored vector codes read-only so forked workers share them through the page cache
+        # (IO_FLAG_MMAP leaves HNSW and flat codes in private memory); the HNSW graph itself is still
+        # read into each process. faiss releases without IO_FLAG_MMAP_IFC share nothing here.
+        mmap_flag = getattr(faiss, 'IO_FLAG_MMAP_IFC', faiss.IO_FLAG_MMAP)
+        self.index = faiss.read_index(index_path, mmap_flag | faiss.IO_FLAG_READ_ONLY)
+        if hasattr(self.index, 'hnsw'):
+            # Search-time breadth of the HNSW graph walk (recall vs latency)
+            self.index.hnsw.efSearch = self.config.get('hnsw_ef_search', 64)
+        if hasattr(self.index, 'nprobe'):
+            # Number of IVF clusters scanned per query (recall vs latency)
+            self.index.nprobe = self.config.get('ivf_nprobe', 16)
+
+        # Memory-map embeddings: pages load on demand and are shared via the page cache
+        embeddings_path = os.path.join(self.model_dir, 'internship_embeddings.npy')
+        if os.path.exists(embeddings_path):
+            self.embeddings = np.load(embeddings_path, mmap_mode='r')
+
+        # Load internships data, reading only the columns the engine uses straight from a
+        # memory-mapped file (Arrow decodes columns without an intermediate read buffer)
+        internships_path = os.path.join(self.model_dir, 'internships.parquet')
         logger.info(f"Loading internships data from: {internships_path}")
-        if not os.path.exists(internships_path):
+        if os.path.exists(internships_path):
+            available_columns = pq.read_schema(internships_path).names
+            self.internships_df = pd.read_parquet(
+                internships_path, columns=[c for c in SERVING_COLUMNS if c in available_columns],
+                memory_map=True
+            )
+        elif os.path.exists(os.path.join(self.model_dir, 'internships.pkl')):
+            # Indexes built before the parquet format
+            logger.warning("internships.parquet not found, falling back to internships.pkl")
+            self.internships_df = pd.read_pickle(os.path.join(self.model_dir, 'internships.pkl'))
+        else:
             raise FileNotFoundError(f"Internships data file not found: {internships_path}")
-        self.internships_df = pd.read_pickle(internships_path)
+        self._precompute_internship_features()
 
         logger.info(f"Loaded index with {self.index.ntotal} internships")
 
+    def _precompute_internship_features(self):
+        """Derive per-internship lookup structures once at load time."""
+        df = self.internships_df
+        if all(f'{column}_lower' in df.columns for column in LOWERCASE_COLUMNS) and \
+                'preferred_skills_tokens' in df.columns:
+            # Normalized at build time; parquet returns list columns as arrays
+            df['preferred_skills_tokens'] = df['preferred_skills_tokens'].map(list)
+            df['sector_tags_tokens'] = df['sector_tags_tokens'].map(list)
+        else:
+            # Artifacts built before normalized columns were stored
+            add_normalized_columns(df)
+        df['preferred_skills_set'] = df['preferred_skills_tokens'].map(frozenset)
+        df['sector_tags_set'] = df['sector_tags_tokens'].map(frozenset)
+
+        # Column arrays for vectorized location, stipend and recency scoring; locations are
+        # interned to int32 ids so matching compares integers rather than strings
+        location_columns = ['location_city_lower', 'location_district_lower', 'location_state_lower']
+        self._location_vocab = {location: i for i, location in
+                                enumerate(sorted(set().union(*(df[column] for column in location_columns))))}
+        self._city_ids, self._district_ids, self._state_ids = (
+            df[column].map(self._location_vocab).to_numpy(dtype=np.int32) for column in location_columns)
+        self._remote = (df['remote_allowed'] == 'yes').to_numpy(dtype=bool)
+
+        stipend_ranges = df['stipend'].map(self._parse_stipend_range)
+        self._stipend_low = np.array([r[0] if r else np.nan for r in stipend_ranges], dtype=np.float64)
+        self._stipend_high = np.array([r[1] if r else np.nan for r in stipend_ranges], dtype=np.float64)
+        self._stipend_unparsed = np.isnan(self._stipend_low)
+
+        self._posted = pd.to_datetime(df['posted_date'], format='%Y-%m-%d', errors='coerce').to_numpy(
+            dtype='datetime64[ns]').astype('datetime64[D]')
+
+        # Column arrays for vectorized qualification, experience and sector scoring
+        qualification = df.get('eligibility_min_qualification', pd.Series('', index=df.index))
+        self._qual_missing = qualification.isna().to_numpy(dtype=bool)
+        self._qual_level_arr = df['eligibility_min_qualification_lower'].map(
+            self.config['qualification_levels']).fillna(0).to_numpy(dtype=np.int8)
+        self._experience_req_arr = self._experience_requirement_categories(
+            df.get('experience_required', pd.Series(np.nan, index=df.index)))
+        # Required experience level per row; category 0 (no requirement stated) counts as beginner
+        exp_levels = self.config['experience_levels']
+        self._experience_req_level = np.array([exp_levels['beginner'], exp_levels['beginner'],
+                                               exp_levels['intermediate'], exp_levels['advanced'],
+                                               exp_levels['expert']])[self._experience_req_arr]
+        self._sector_empty = (df['sector_tags_tokens'].map(len) == 0).to_numpy(dtype=bool)
+
+        # Integer ids of the lowercase sector string, city and organization for diversity counting
+        self._diversity_key_ids = {}
+        for key, column in (('sector', 'sector_tags'), ('location', 'location_city'), ('organization', 'organization')):
+            self._diversity_key_ids[key] = pd.factorize(df[column].astype(str).str.lower())[0].astype(np.int32)
+        self._stipend_present = (df['stipend'].astype(str) != '').to_numpy(dtype=bool)
+
+        # Inverted indexes (value -> row positions) used to prefilter FAISS retrieval
+        sector_ids = {}
+        for position, sectors in enumerate(df['sector_tags_tokens']):
+            for sector in sectors:
+                sector_ids.setdefault(sector, []).append(position)
+        self._sector_to_ids = {sector: np.asarray(ids, dtype=np.int64) for sector, ids in sector_ids.items()}
+
+        location_ids = {}
+        for column in ('location_city_lower', 'location_district_lower', 'location_state_lower'):
+            for position, location in enumerate(df[column]):
+                if location:
+                    location_ids.setdefault(location, set()).add(position)
+        self._location_to_ids = {location: np.asarray(sorted(ids), dtype=np.int64)
+                                 for location, ids in location_ids.items()}
+
+        self._build_skill_match_matrix()
+
+        # Plain column arrays so the ranking loop reads fields without building a Series per row
+        self._cols = {column: df[column].to_numpy() for column in df.columns}
+        self._id_to_position = {internship_id: position for position, internship_id in
+                                enumerate(self._cols['internship_id'])}
+        self._recommendation_bases = self._build_recommendation_bases(df)
+
+    @staticmethod
+    def _build_recommendation_bases(df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Per-row recommendation fields that do not depend on the candidate, converted once."""
+        def text(column):
+            if column not in df.columns:
+                return [''] * len(df)
+            return [str(value) for value in df[column].tolist()]
+
+        ids, titles, organizations = text('internship_id'), text('title'), text('organization')
+        cities, districts, states = text('location_city'), text('location_district'), text('location_state')
+        stipends, deadlines, urls = text('stipend'), text('application_deadline'), text('url')
+        posted_dates, sectors, descriptions = text('posted_date'), text('sector_tags'), text('description')
+        remote = text('remote_allowed')
+        durations = df['duration_weeks'].tolist() if 'duration_weeks' in df.columns else [0] * len(df)
+
+        return [{
+            'internship_id': ids[i],
+            'title': titles[i],
+            'organization': organizations[i],
+            'location': {'city': cities[i], 'district': districts[i], 'state': states[i]},
+            'stipend': stipends[i],
+            'duration_weeks': durations[i],
+            'remote_allowed': remote[i] == 'yes',
+            'application_deadline': deadlines[i],
+            'url': urls[i],
+            'posted_date': posted_dates[i],
+            'sector_tags': sectors[i],
+            'description': descriptions[i]
+        } for i in range(len(df))]
+
+    def _row(self, position: int) -> InternshipRow:
+        """Internship fields at a row position (cheaper than DataFrame.iloc)."""
+        return InternshipRow(self._cols, position)
+
+    @staticmethod
+    def _experience_requirement_categories(requirements: pd.Series) -> np.ndarray:
+        """Map experience requirement text to 0 (none stated), 1 beginner, 2 intermediate, 3 advanced or 4 expert."""
+        text = requirements.fillna('').astype(str).str.lower()
+
+        categories = np.select(
+            [text.str.contains(pattern).to_numpy(dtype=bool) for _, pattern in _EXPERIENCE_REQUIREMENT_PATTERNS],
+            [1, 2, 3], default=4)
+        return np.where(text.to_numpy(dtype=object) == '', 0, categories).astype(np.int8)
+
+    def _build_skill_match_matrix(self):
+        """Precompute domain-aligned match scores between every pair of known skills."""
+        df = self.internships_df
+
+        # Vocabulary of internship skill tokens plus every taxonomy skill
+        vocab = {}
+        for skills in df['preferred_skills_tokens']:
+            for skill in skills:
+                vocab.setdefault(skill, len(vocab))
+        for skill in self._skill_to_domain:
+            vocab.setdefault(skill, len(vocab))
+        self.skill_vocab = vocab
+        self._vocab_skills = list(vocab)
+        df['preferred_skills_ids'] = [np.array([vocab[skill] for skill in skills], dtype=np.int64)
+                                      for skills in df['preferred_skills_tokens']]
+
+        # Domain compatibility as a dense (domain x domain) lookup table
+        domain_compatibility = self.config.get('skill_taxonomy', {}).get('domain_compatibility', {})
+        domains = set(self._skill_to_domain.values()) | set(domain_compatibility) | {'unknown'}
+        for compatible in domain_compatibility.values():
+            domains.update(compatible)
+        self._domain_ids = {domain: i for i, domain in enumerate(sorted(domains))}
+        self.domain_compat = np.zeros((len(domains), len(domains)), dtype=np.float64)
+        for candidate_domain, i in self._domain_ids.items():
+            for internship_domain, j in self._domain_ids.items():
+                self.domain_compat[i, j] = self._taxonomy_domain_compatibility(candidate_domain, internship_domain)
+        self._vocab_domain_ids = np.array([self._domain_ids[self.get_skill_domain(skill)]
+                                           for skill in self._vocab_skills], dtype=np.int64)
+
+        self.match_matrix = self._load_or_build_skill_match_matrix()
+
+        # Sparse (internship x vocab) skill incidence for the coarse skill-overlap stage
+        skill_ids = df['preferred_skills_ids']
+        lengths = np.fromiter((len(ids) for ids in skill_ids), dtype=np.int64, count=len(df))
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        indices = np.concatenate(list(skill_ids)) if len(df) else np.zeros(0, dtype=np.int64)
+        self._skill_incidence = sparse.csr_matrix((np.ones(len(indices), dtype=np.int32), indices, indptr),
+                                                  shape=(len(df), len(vocab)))
+
+    def _load_or_build_skill_match_matrix(self) -> sparse.csr_matrix:
+        """Sparse (vocab x vocab) skill match scores, reused from disk when skills and scoring config are unchanged."""
+        # The matrix is quadratic in the vocabulary, so rebuilding it dominates cold starts on large corpora
+        key = hashlib.blake2b(json.dumps([
+            _SKILL_MATRIX_FORMAT_VERSION,
+            self._vocab_skills,
+            self.config.get('skill_taxonomy', {}),
+            self.config.get('skill_scoring', {}),
+        ], sort_keys=True, default=str).encode('utf-8'), digest_size=16).hexdigest()
+        matrix_path = os.path.join(self.model_dir, SKILL_MATCH_MATRIX_FILE)
+
+        if os.path.exists(matrix_path):
+            try:
+                with np.load(matrix_path) as stored:
+                    if str(stored['key']) == key:
+                        size = len(self._vocab_skills)
+                        return sparse.csr_matrix((stored['data'], stored['indices'], stored['indptr']),
+                                                 shape=(size, size))
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable skill match matrix: {e}")
+
+        match_matrix = self._compute_skill_match_matrix()
+        temp_path = None
+        try:
+            # Write to a temp file and rename it into place so concurrent loaders never read a partial file
+            fd, temp_path = tempfile.mkstemp(dir=self.model_dir, suffix='.npz')
+            with os.fdopen(fd, 'wb') as f:
+                # Uncompressed so a restart reads the arrays straight back without inflating them
+                np.savez(f, key=np.array(key), data=match_matrix.data,
+                         indices=match_matrix.indices, indptr=match_matrix.indptr)
+            os.replace(temp_path, matrix_path)
+        except OSError as e:
+            logger.warning(f"Could not persist skill match matrix: {e}")
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+        return match_matrix
+
+    def _compute_skill_match_matrix(self) -> sparse.csr_matrix:
+        """Compute domain-aligned match scores between every pair of vocabulary skills."""
+        vocab = self.skill_vocab
+
+        # Substring containment between vocab skills: one Aho-Corasick scan per skill finds every
+        # vocab skill it contains, instead of a str.find for each of the |vocab|^2 pairs
+        contains = np.zeros((len(vocab), len(vocab)), dtype=bool)  # contains[i, j]: skill j occurs in skill i
+        automaton = build_automaton(self._vocab_skills)
+        for i, skill in enumerate(self._vocab_skills):
+            for contained in find_patterns(automaton, skill):
+                contains[i, vocab[contained]] = True
+        if '' in vocab:
+            contains[:, vocab['']] = True  # the empty token occurs in every skill
+        substring = contains | contains.T
+
+        # Most skill pairs never match, so keep only the nonzero scores
+        rows, cols, data = [], [], []
+        for i, skill in enumerate(self._vocab_skills):
+            scores = self._skill_match_scores(skill, self._vocab_skills, self._vocab_domain_ids, substring[i])
+            hits = np.flatnonzero(scores)
+            rows.extend([i] * len(hits))
+            cols.extend(hits)
+            data.extend(scores[hits])
+        match_matrix = sparse.csr_matrix((data, (rows, cols)), shape=(len(vocab), len(vocab)), dtype=np.float64)
+        logger.info(f"Built skill match matrix over {len(vocab)} skills ({match_matrix.nnz} matching pairs)")
+        return match_matrix
+
+    def _skill_match_scores(self, candidate_skill: str, internship_skills: List[str],
+                            internship_domain_ids: Optional[np.ndarray] = None,
+                            substring: Optional[np.ndarray] = None) -> np.ndarray:
+        """Score a lowercase candidate skill against each internship skill under the domain-aligned rules."""
+        skill_config = self.config['skill_scoring']
+        if internship_domain_ids is None:
+            internship_domain_ids = np.array([self._domain_ids[self.get_skill_domain(skill)]
+                                              for skill in internship_skills], dtype=np.int64)
+        candidate_domain_id = self._domain_ids[self.get_skill_domain(candidate_skill)]
+
+        # Same-domain substring matches score domain_match; compatible domains are scaled down
+        if substring is None:
+            substring = np.array([candidate_skill in skill or skill in candidate_skill for skill in internship_skills],
+                                 dtype=bool)
+        same_domain = internship_domain_ids == candidate_domain_id
+        scores = np.where(same_domain, skill_config.get('domain_match', 2.0),
+                          skill_config.get('cross_domain', 0.5) * self.domain_compat[candidate_domain_id,
+                                                                                     internship_domain_ids])
+        scores = np.where(substring, scores, 0.0)
+
+        # Exact matches get the highest score
+        exact = np.array([candidate_skill == skill for skill in internship_skills], dtype=bool)
+        return np.where(exact, skill_config['exact_match'], scores)
+
+    def _build_candidate_skill_rows(self, candidate_skills: Tuple[str, ...]) -> np.ndarray:
+        """Dense (candidate skill x vocab) score rows, gathered from the match matrix when possible."""
+        rows = np.zeros((len(candidate_skills), len(self._vocab_skills)), dtype=np.float64)
+        for i, skill in enumerate(candidate_skills):
+            vocab_id = self.skill_vocab.get(skill)
+            if vocab_id is not None:
+                rows[i] = self.match_matrix[vocab_id].toarray()[0]
+            else:
+                rows[i] = self._skill_match_scores(skill, self._vocab_skills, self._vocab_domain_ids)
+        rows.setflags(write=False)
+        return rows
+
+    def _load_encoder(self):
+        """Load the quantized ONNX encoder if exported, else the sentence transformer."""
+        model_name = self.config['embedding_model']
+        onnx_dir = os.path.join(self.model_dir, ONNX_SUBDIR)
+
+        if self.config.get('use_onnx_encoder', True) and os.path.exists(os.path.join(onnx_dir, ONNX_MODEL_FILE)):
+            try:
+                logger.info(f"Loading quantized ONNX encoder from: {onnx_dir}")
+                return OnnxSentenceEncoder(onnx_dir,
+                                           intra_op_num_threads=self.config.get('onnx_intra_op_threads', 1))
+            except ImportError as e:
+                logger.warning(f"ONNX Runtime unavailable, falling back to SentenceTransformer: {e}")
+
+        return SentenceTransformer(model_name)
+
     def create_candidate_profile_text(self, candidate: Dict[str, Any]) -> str:
         """Create a text representation of the candidate profile for embedding."""
         text_parts = []
@@ -192,97 +796,186 @@ class InternshipRecommendationEngine:
 
         return '. '.join(text_parts)
 
-    def retrieve_similar_internships(self, candidate_embedding: np.ndarray, top_k: int = None) -> Tuple[np.ndarray, np.ndarray]:
-        """Retrieve similar internships using FAISS."""
+    def _encode_profile_text(self, profile_text: str) -> np.ndarray:
+        """Encode a profile text, reusing an embedding persisted on disk when available."""
+        cache_config = self.config.get('profile_embedding_cache', {})
+        cache_path = None
+
+        if cache_config.get('persist', False):
+            # Key on model name as well so a model change never serves stale vectors
+            key = hashlib.blake2b(f"{self.config['embedding_model']}\n{profile_text}".encode('utf-8'),
+                                  digest_size=16).hexdigest()
+            cache_dir = os.path.join(self.model_dir, 'profile_embeddings')
+            cache_path = os.path.join(cache_dir, f"{key}.npy")
+            if os.path.exists(cache_path):
+                try:
+                    embedding = np.load(cache_path)
+                    embedding.setflags(write=False)
+                    return embedding
+                except (OSError, ValueError, EOFError) as e:
+                    # A damaged file is a cache miss; the fresh embedding below overwrites it
+                    logger.warning(f"Ignoring unreadable profile embedding {cache_path}: {e}")
+
+        embedding = np.asarray(self.model.encode([profile_text])[0], dtype=np.float32)
+
+        if cache_path:
+            temp_path = None
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                # Write to a temp file and rename it into place so workers caching the same
+                # profile concurrently never read a partial file
+                fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.npy')
+                with os.fdopen(fd, 'wb') as f:
+                    np.save(f, embedding)
+                os.replace(temp_path, cache_path)
+            except OSError as e:
+                logger.warning(f"Could not persist profile embedding: {e}")
+                if temp_path and os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+        # Cached arrays are shared between requests, so guard against in-place edits
+        embedding.setflags(write=False)
+        return embedding
+
+    def _prefilter_internship_ids(self, candidate: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Get internship row ids eligible for retrieval, or None to search the whole index."""
+        prefilter_config = self.config.get('retrieval_prefilter', {})
+        min_candidates = prefilter_config.get('min_candidates', 1)
+
+        # Sector prefilter (same substring matching as sector relevance scoring); a preference,
+        # so it is dropped when too few internships match and reranking decides instead
+        sector_ids = None
+        candidate_sectors = [sector.lower() for sector in candidate.get('preferred_sectors', [])]
+        if prefilter_config.get('sectors', False) and candidate_sectors:
+            matching = [ids for sector, ids in self._sector_to_ids.items()
+                        if any(c in sector or sector in c for c in candidate_sectors)]
+            sector_ids = np.unique(np.concatenate(matching)) if matching else np.empty(0, dtype=np.int64)
+            if len(sector_ids) < min_candidates:
+                sector_ids = None
+
+        # Candidates who don't want remote work are never shown internships outside their locations,
+        # so this filter always applies, however few rows match (small sets are scored exactly)
+        location_ids = None
+        candidate_locations = candidate.get('preferred_locations', [])
+        if prefilter_config.get('locations', False) and candidate_locations and not candidate.get('remote_ok', False):
+            matching = [self._location_to_ids[loc.lower()] for loc in candidate_locations
+                        if loc.lower() in self._location_to_ids]
+            location_ids = np.unique(np.concatenate(matching)) if matching else np.empty(0, dtype=np.int64)
+
+        if sector_ids is None or location_ids is None:
+            return location_ids if sector_ids is None else sector_ids
+        both = np.intersect1d(sector_ids, location_ids)
+        return both if len(both) >= min_candidates else location_ids
+
+    def _search_params(self, selector, selectivity: float = 1.0) -> 'faiss.SearchParameters':
+        """Build index-appropriate FAISS search parameters for an ID selector.
+
+        selectivity is the fraction of the index the selector allows; graph and cluster search
+        breadth grow in proportion so rare eligible ids are still reached.
+        """
+        scale = 1.0 / max(selectivity, 1e-6)
+        if hasattr(self.index, 'hnsw'):
+            ef_search = min(int(self.index.hnsw.efSearch * scale), max(self.index.ntotal, 1))
+            return faiss.SearchParametersHNSW(sel=selector, efSearch=max(ef_search, self.index.hnsw.efSearch))
+        if hasattr(self.index, 'nprobe'):
+            nprobe = min(int(self.index.nprobe * scale), self.index.nlist)
+            return faiss.SearchParametersIVF(sel=selector, nprobe=max(nprobe, self.index.nprobe))
+        return faiss.SearchParameters(sel=selector)
+
+    def retrieve_similar_internships(self, candidate_embedding: np.ndarray, top_k: int = None,
+                                     candidate: Optional[Dict[str, Any]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Retrieve similar internships using FAISS, restricted to eligible ids when a candidate is given."""
         if top_k is None:
             top_k = self.config['top_k_retrieval']
 
-        # Search for similar internships
-        scores, indices = self.index.search(candidate_embedding.reshape(1, -1), top_k)
+        # Unit-normalize a copy of the query (cached embeddings are read-only) so that
+        # inner product against the pre-normalized index equals cosine similarity
+        query = np.array(candidate_embedding, dtype=np.float32).reshape(1, -1)
+        faiss.normalize_L2(query)
 
-        return scores[0], indices[0]
-
-    def calculate_skill_overlap_score(self, candidate_skills: List[str], internship_skills: str) -> float:
-        """Calculate skill overlap score between candidate and internship."""
-        if not candidate_skills or pd.isna(internship_skills):
+        # Search for similar internships
+        allowed_ids = self._prefilter_internship_ids(candidate) if candidate else None
+        if allowed_ids is None:
+            scores, indices = self.index.search(query, top_k)
+        elif self.embeddings is not None and len(allowed_ids) <= top_k * self.config.get(
+                'retrieval_prefilter', {}).get('exact_search_multiple', 10):
+            # Few eligible rows: score them exactly, since a filtered graph walk can miss some of them
+            similarities = self.embeddings[allowed_ids] @ query[0]
+            order = np.argsort(-similarities, kind='stable')[:top_k]
+            return similarities[order], allowed_ids[order]
+        else:
+            selector = faiss.IDSelectorBatch(allowed_ids)
+            params = self._search_params(selector, len(allowed_ids) / max(self.index.ntotal, 1))
+            scores, indices = self.index.search(query, top_k, params=params)
+
+        # Filtered searches can return fewer than top_k hits (padded with -1)
+        found = indices[0] >= 0
+        return scores[0][found], indices[0][found]
+
+    def calculate_skill_overlap_score(self, candidate_skills: List[str], internship_skill_list: List[str],
+                                      internship_skill_set: Optional[frozenset] = None) -> float:
+        """Calculate skill overlap score between candidate and pre-tokenized internship skills."""
+        if not candidate_skills or not internship_skill_list:
             return 0.0
 
-        # Parse internship skills (comma-separated)
-        internship_skill_list = [skill.strip().lower() for skill in internship_skills.split(',')]
+        if internship_skill_set is None:
+            internship_skill_set = frozenset(internship_skill_list)
 
-        total_score = 0.0
-        max_skills = min(len(candidate_skills), self.config['skill_scoring']['max_skills'])
+        skill_config = self.config['skill_scoring']
+        max_skills = min(len(candidate_skills), skill_config['max_skills'])
+        candidate_skill_list = [skill.lower() for skill in candidate_skills[:max_skills]]
 
-        for candidate_skill in candidate_skills[:max_skills]:
-            candidate_skill_lower = candidate_skill.lower()
-            best_match_score = 0.0
+        # Pairwise fuzzy similarity for all (candidate, internship) skill pairs in one C call
+        similarity = process.cdist(candidate_skill_list, internship_skill_list, scorer=fuzz.ratio,
+                                   dtype=np.float64) / 100.0
+        exact = np.array([skill in internship_skill_set for skill in candidate_skill_list], dtype=bool)
 
-            for internship_skill in internship_skill_list:
-                # Exact match
-                if candidate_skill_lower == internship_skill:
-                    best_match_score = self.config['skill_scoring']['exact_match']
-                    break
-                # Fuzzy match with improved thresholds
-                else:
-                    similarity = SequenceMatcher(None, candidate_skill_lower, internship_skill).ratio()
-                    # Lower threshold for better matching, especially for design tools
-                    if similarity > 0.7:  # Reduced from 0.8
-                        best_match_score = max(best_match_score, self.config['skill_scoring']['partial_match'] * similarity)
-                    # Special handling for design tools
-                    elif self._is_design_tool_match(candidate_skill_lower, internship_skill):
-                        best_match_score = max(best_match_score, self.config['skill_scoring']['partial_match'] * 0.8)
+        # Fuzzy match with improved thresholds (lower threshold helps design tools)
+        fuzzy_match = similarity > 0.7
+        pair_scores = np.where(fuzzy_match, skill_config['partial_match'] * similarity, 0.0)
+
+        # Special handling for design tools where the fuzzy match failed
+        design_match = np.array([[not fuzzy_match[i, j] and self._is_design_tool_match(candidate_skill, internship_skill)
+                                  for j, internship_skill in enumerate(internship_skill_list)]
+                                 for i, candidate_skill in enumerate(candidate_skill_list)], dtype=bool)
+        pair_scores = np.where(design_match, skill_config['partial_match'] * 0.8, pair_scores)
 
-            total_score += best_match_score
+        # Exact matches take precedence over any fuzzy score
+        best_match_scores = np.where(exact, skill_config['exact_match'], pair_scores.max(axis=1))
 
         # Normalize by number of candidate skills considered to get a score between 0 and exact_match
+        total_score = float(best_match_scores.sum())
         if max_skills > 0:
             total_score /= max_skills
 
-        return min(total_score, self.config['skill_scoring']['exact_match'])  # Cap at max score
+        return min(total_score, skill_config['exact_match'])  # Cap at max score
 
     def _is_design_tool_match(self, candidate_skill: str, internship_skill: str) -> bool:
         """Check for design tool matches using semantic similarity."""
-        design_tools = {
-            'photoshop': ['photoshop', 'adobe photoshop', 'ps', 'photoshop cc'],
-            'figma': ['figma', 'figma design', 'ui design'],
-            'illustrator': ['illustrator', 'adobe illustrator', 'ai'],
-            'premiere': ['premiere', 'premiere pro', 'adobe premiere'],
-            'after effects': ['after effects', 'ae', 'motion graphics'],
-            'indesign': ['indesign', 'adobe indesign'],
-            'sketch': ['sketch', 'sketch app'],
-            'xd': ['xd', 'adobe xd', 'experience design'],
-            'canva': ['canva', 'canva design'],
-            'video editing': ['video editing', 'video production', 'editing', 'post production']
-        }
+        # Check if candidate skill maps to a design tool category
+        tool = _VARIATION_TO_TOOL.get(candidate_skill.lower())
+        if tool is None:
+            return False
 
-        candidate_lower = candidate_skill.lower()
         internship_lower = internship_skill.lower()
-
-        # Check if candidate skill maps to any design tool category
-        for tool, variations in design_tools.items():
-            if candidate_lower in variations:
-                # Check if internship skill is related to any variation
-                if any(var in internship_lower for var in variations):
-                    return True
-                # Also check for general design terms
-                if any(term in internship_lower for term in ['design', 'creative', 'graphic', 'ui', 'ux']):
-                    return True
-
-        return False
+        # Internship skill is related to any variation, or is a general design term
+        return (any(var in internship_lower for var in DESIGN_TOOLS[tool]) or
+                any(term in internship_lower for term in _GENERAL_DESIGN_TERMS))
 
     def get_skill_domain(self, skill: str) -> str:
         """Get the domain category for a given skill."""
-        skill_lower = skill.lower()
-        taxonomy = self.config['skill_taxonomy']
-
-        for domain, skills in taxonomy['domains'].items():
-            if skill_lower in [s.lower() for s in skills]:
-                return domain
-
-        return 'unknown'
+        return self._skill_to_domain.get(skill.lower(), 'unknown')
 
     def are_domains_compatible(self, candidate_domain: str, internship_domain: str) -> float:
         """Check if two skill domains are compatible and return compatibility score."""
+        candidate_id = self._domain_ids.get(candidate_domain)
+        internship_id = self._domain_ids.get(internship_domain)
+        if candidate_id is not None and internship_id is not None:
+            return float(self.domain_compat[candidate_id, internship_id])
+        return self._taxonomy_domain_compatibility(candidate_domain, internship_domain)
+
+    def _taxonomy_domain_compatibility(self, candidate_domain: str, internship_domain: str) -> float:
+        """Domain compatibility straight from the skill taxonomy config."""
         if candidate_domain == internship_domain:
             return 1.0  # Same domain - perfect match
 
@@ -295,92 +988,75 @@ class InternshipRecommendationEngine:
 
         return 0.0  # Not compatible
 
-    def calculate_domain_aligned_skill_score(self, candidate_skills: List[str], internship_skills: str) -> Tuple[float, Dict[str, Any]]:
+    def calculate_domain_aligned_skill_score(self, candidate_skills: List[str], internship_skill_list: List[str],
+                                             internship_skill_ids: Optional[np.ndarray] = None
+                                             ) -> Tuple[float, Dict[str, Any]]:
         """Calculate skill score with domain alignment and taxonomy awareness."""
-        if not candidate_skills or pd.isna(internship_skills):
+        if not candidate_skills or not internship_skill_list:
             return 0.0, {"matched_skills": [], "domain_matches": [], "skill_gaps": []}
 
         skill_config = self.config['skill_scoring']
-        internship_skill_list = [skill.strip().lower() for skill in internship_skills.split(',')]
 
         total_score = 0.0
         matched_skills = []
         domain_matches = []
         skill_gaps = []
-
-        # Analyze candidate skills by domain
-        candidate_domains = {}
-        for skill in candidate_skills:
-            domain = self.get_skill_domain(skill)
-            if domain not in candidate_domains:
-                candidate_domains[domain] = []
-            candidate_domains[domain].append(skill.lower())
-
-        # Analyze internship requirements by domain
-        internship_domains = {}
-        for skill in internship_skill_list:
-            domain = self.get_skill_domain(skill)
-            if domain not in internship_domains:
-                internship_domains[domain] = []
-            internship_domains[domain].append(skill)
+        skills_by_domain = None  # internship skills grouped by domain, built on the first skill gap
 
         # Calculate domain-aligned scores
         max_skills = min(len(candidate_skills), skill_config['max_skills'])
+        considered_skills = candidate_skills[:max_skills]
+        candidate_lower = tuple(skill.lower() for skill in considered_skills)
+
+        # (candidate skill x internship skill) scores gathered from the precomputed match matrix
+        if internship_skill_ids is None and all(skill in self.skill_vocab for skill in internship_skill_list):
+            internship_skill_ids = np.array([self.skill_vocab[skill] for skill in internship_skill_list],
+                                            dtype=np.int64)
+        if internship_skill_ids is not None:
+            pair_scores = self._candidate_skill_rows(candidate_lower)[:, internship_skill_ids]
+        else:
+            pair_scores = np.array([self._skill_match_scores(skill, internship_skill_list)
+                                    for skill in candidate_lower])
 
-        for candidate_skill in candidate_skills[:max_skills]:
-            candidate_skill_lower = candidate_skill.lower()
+        for candidate_skill, candidate_skill_lower, scores in zip(considered_skills, candidate_lower, pair_scores):
             candidate_domain = self.get_skill_domain(candidate_skill)
             best_score = 0.0
-            best_match = None
 
-            for internship_skill in internship_skill_list:
+            # The first matching internship skill wins, as in a left-to-right scan
+            hits = np.flatnonzero(scores)
+            if hits.size:
+                internship_skill = internship_skill_list[hits[0]]
                 internship_domain = self.get_skill_domain(internship_skill)
+                best_score = float(scores[hits[0]])
+                matched_skills.append(candidate_skill)
 
-                # Exact match gets highest score
                 if candidate_skill_lower == internship_skill:
-                    best_score = skill_config['exact_match']
-                    best_match = internship_skill
-                    matched_skills.append(candidate_skill)
                     domain_matches.append({
                         'skill': candidate_skill,
                         'match_type': 'exact',
                         'domain': candidate_domain
                     })
-                    break
-
-                # Domain-aligned match
                 elif candidate_domain == internship_domain:
-                    if candidate_skill_lower in internship_skill or internship_skill in candidate_skill_lower:
-                        best_score = skill_config['domain_match']
-                        best_match = internship_skill
-                        matched_skills.append(candidate_skill)
-                        domain_matches.append({
-                            'skill': candidate_skill,
-                            'match_type': 'domain_match',
-                            'domain': candidate_domain
-                        })
-                        break
-
-                # Cross-domain compatible match
-                elif self.are_domains_compatible(candidate_domain, internship_domain) > 0:
-                    if candidate_skill_lower in internship_skill or internship_skill in candidate_skill_lower:
-                        compatibility_score = self.are_domains_compatible(candidate_domain, internship_domain)
-                        best_score = skill_config['cross_domain'] * compatibility_score
-                        best_match = internship_skill
-                        matched_skills.append(candidate_skill)
-                        domain_matches.append({
-                            'skill': candidate_skill,
-                            'match_type': 'cross_domain',
-                            'domain': candidate_domain,
-                            'target_domain': internship_domain
-                        })
-                        break
+                    domain_matches.append({
+                        'skill': candidate_skill,
+                        'match_type': 'domain_match',
+                        'domain': candidate_domain
+                    })
+                else:
+                    domain_matches.append({
+                        'skill': candidate_skill,
+                        'match_type': 'cross_domain',
+                        'domain': candidate_domain,
+                        'target_domain': internship_domain
+                    })
 
             if best_score < skill_config['min_skill_threshold']:
+                if skills_by_domain is None:
+                    skills_by_domain = self._group_skills_by_domain(internship_skill_list)
                 skill_gaps.append({
                     'skill': candidate_skill,
                     'domain': candidate_domain,
-                    'suggested_matches': [s for s in internship_skill_list if self.get_skill_domain(s) == candidate_domain]
+                    'suggested_matches': list(skills_by_domain.get(candidate_domain, ()))
                 })
 
             total_score += best_score
@@ -395,47 +1071,121 @@ class InternshipRecommendationEngine:
             "skill_gaps": skill_gaps
         }
 
-    def _get_matched_skills(self, candidate_skills: List[str], internship_skills: str) -> List[str]:
-        """Get list of skills that matched between candidate and internship."""
-        if not candidate_skills or pd.isna(internship_skills):
+    def _group_skills_by_domain(self, skills: List[str]) -> Dict[str, List[str]]:
+        """Map each domain to the given skills in it, keeping their order."""
+        skills_by_domain = {}
+        for skill in skills:
+            skills_by_domain.setdefault(self.get_skill_domain(skill), []).append(skill)
+        return skills_by_domain
+
+    def _skill_hit_mask(self, candidate_skills: List[str], positions: np.ndarray) -> np.ndarray:
+        """Coarse stage of skill scoring: which internships have any nonzero skill pair for the candidate.
+
+        Internships outside the mask score 0 under calculate_domain_aligned_skill_score, so the
+        fine stage only needs to run for the rest.
+        """
+        considered = tuple(skill.lower() for skill in candidate_skills[:self.config['skill_scoring']['max_skills']])
+        if not considered:
+            return np.zeros(len(positions), dtype=bool)
+        vocab_hits = self._candidate_skill_rows(considered).any(axis=0).astype(np.int32)
+        return self._skill_incidence[positions] @ vocab_hits > 0
+
+    def _unmatched_skill_score(self, candidate_skills: List[str],
+                               internship_skill_list: List[str]) -> Tuple[float, Dict[str, Any]]:
+        """calculate_domain_aligned_skill_score for an internship none of the candidate's skills match."""
+        if not candidate_skills or not internship_skill_list:
+            return 0.0, {"matched_skills": [], "domain_matches": [], "skill_gaps": []}
+
+        skill_config = self.config['skill_scoring']
+        skill_gaps = []
+        if skill_config['min_skill_threshold'] > 0.0:
+            skills_by_domain = self._group_skills_by_domain(internship_skill_list)
+            for candidate_skill in candidate_skills[:skill_config['max_skills']]:
+                candidate_domain = self.get_skill_domain(candidate_skill)
+                skill_gaps.append({
+                    'skill': candidate_skill,
+                    'domain': candidate_domain,
+                    'suggested_matches': list(skills_by_domain.get(candidate_domain, ()))
+                })
+
+        return 0.0, {
+            "matched_skills": [],
+            "domain_matches": [],
+            "skill_gaps": skill_gaps
+        }
+
+    def _score_internship_skills(self, candidate_skills: Tuple[str, ...],
+                                 internship_id: str) -> Tuple[float, Dict[str, Any]]:
+        """calculate_domain_aligned_skill_score for a dataset internship (memoized per instance).
+
+        The returned details are shared between cache hits and must not be mutated.
+        """
+        position = self._id_to_position[internship_id]
+        return self.calculate_domain_aligned_skill_score(
+            list(candidate_skills),
+            self._cols['preferred_skills_tokens'][position],
+            self._cols['preferred_skills_ids'][position]
+        )
+
+    def _match_internship_skills(self, candidate_skills: Tuple[str, ...], internship_id: str) -> Tuple[str, ...]:
+        """_get_matched_skills for a dataset internship (memoized per instance)."""
+        position = self._id_to_position[internship_id]
+        return tuple(self._get_matched_skills(
+            list(candidate_skills),
+            self._cols['preferred_skills_tokens'][position],
+            self._cols['preferred_skills_set'][position],
+            self._cols['preferred_skills_ids'][position]
+        ))
+
+    def _get_matched_skills(self, candidate_skills: List[str], internship_skill_list: List[str],
+                            internship_skill_set: Optional[frozenset] = None,
+                            internship_skill_ids: Optional[np.ndarray] = None) -> List[str]:
+        """Get list of skills that matched between candidate and pre-tokenized internship skills."""
+        if not candidate_skills or not internship_skill_list:
             return []
 
-        internship_skill_list = [skill.strip().lower() for skill in internship_skills.split(',')]
-        matched_skills = []
+        candidate_skill_list = [skill.lower() for skill in candidate_skills]
 
-        for candidate_skill in candidate_skills:
-            candidate_skill_lower = candidate_skill.lower()
+        # Check for exact match first (on interned skill ids when available)
+        if internship_skill_ids is not None:
+            candidate_skill_ids = np.array([self.skill_vocab.get(skill, -1) for skill in candidate_skill_list])
+            exact = np.isin(candidate_skill_ids, internship_skill_ids)
+        else:
+            if internship_skill_set is None:
+                internship_skill_set = frozenset(internship_skill_list)
+            exact = np.array([skill in internship_skill_set for skill in candidate_skill_list], dtype=bool)
 
-            # Check for exact match first
-            if candidate_skill_lower in internship_skill_list:
-                matched_skills.append(candidate_skill)
-                continue
+        # Then partial matches over all pairs in one C call
+        similarity = process.cdist(candidate_skill_list, internship_skill_list, scorer=fuzz.ratio,
+                                   dtype=np.float64)
+        partial = (similarity > 70).any(axis=1)
 
-            # Check for partial matches
-            for internship_skill in internship_skill_list:
-                similarity = SequenceMatcher(None, candidate_skill_lower, internship_skill).ratio()
-                if similarity > 0.7:
-                    matched_skills.append(candidate_skill)
-                    break
+        # Check design tool matches for skills with no exact or partial match
+        design = np.array([not (exact[i] or partial[i]) and
+                           any(self._is_design_tool_match(skill, internship_skill)
+                               for internship_skill in internship_skill_list)
+                           for i, skill in enumerate(candidate_skill_list)], dtype=bool)
 
-                # Check design tool matches
-                if self._is_design_tool_match(candidate_skill_lower, internship_skill):
-                    matched_skills.append(candidate_skill)
-                    break
+        matched_skills = [candidate_skills[i] for i in np.flatnonzero(exact | partial | design)]
 
         return matched_skills[:5]  # Limit to top 5 matches
 
-    def _get_matched_sectors(self, candidate_sectors: List[str], internship_sectors: str) -> List[str]:
-        """Get list of sectors that matched between candidate and internship."""
-        if not candidate_sectors or pd.isna(internship_sectors):
+    def _get_matched_sectors(self, candidate_sectors: List[str], internship_sector_list: List[str],
+                             internship_sector_set: Optional[frozenset] = None) -> List[str]:
+        """Get list of sectors that matched between candidate and pre-tokenized internship sectors."""
+        if not candidate_sectors or not internship_sector_list:
             return []
 
-        internship_sector_list = [sector.strip().lower() for sector in internship_sectors.split(',')]
         matched_sectors = []
 
         for candidate_sector in candidate_sectors:
             candidate_sector_lower = candidate_sector.lower()
 
+            # Exact tag matches need no substring scan
+            if internship_sector_set is not None and candidate_sector_lower in internship_sector_set:
+                matched_sectors.append(candidate_sector)
+                continue
+
             for internship_sector in internship_sector_list:
                 if (candidate_sector_lower in internship_sector or
                     internship_sector in candidate_sector_lower):
@@ -444,6 +1194,15 @@ class InternshipRecommendationEngine:
 
         return matched_sectors
 
+    def _components_matched_sectors(self, components: Dict[str, Any], internship: Mapping[str, Any],
+                                    candidate: Dict[str, Any]) -> List[str]:
+        """Matched sectors from the components when already computed, else computed for the row."""
+        if 'matched_sectors' in components:
+            return components['matched_sectors']
+        return self._get_matched_sectors(candidate.get('preferred_sectors', []),
+                                         internship.get('sector_tags_tokens', []),
+                                         internship.get('sector_tags_set'))
+
     def calculate_qualification_fit_score(self, candidate_education: str, required_qualification: str,
                                          candidate_experience: int = 0) -> Tuple[float, str]:
         """Calculate qualification fit score with strict filtering and experience consideration."""
@@ -483,11 +1242,18 @@ class InternshipRecommendationEngine:
 
         # Experience compensation for qualification gaps
         if qual_filter['experience_override'] and abs(candidate_level - required_level) > 0:
-            experience_bonus = min(candidate_experience * 0.1, 0.3)  # Max 30% bonus
-            score = min(score + experience_bonus, 1.0)
+            experience_bonus = candidate_experience * 0.1
+            experience_bonus = experience_bonus if experience_bonus < 0.3 else 0.3  # Max 30% bonus
+            score = score + experience_bonus
+            score = score if score < 1.0 else 1.0
 
         return score, reason
 
+    def _candidate_experience_level(self, candidate_experience: float) -> int:
+        """Map years of experience to the configured experience level."""
+        level_name = _EXPERIENCE_LEVEL_NAMES[np.searchsorted(_EXPERIENCE_BOUNDS, candidate_experience, side='left')]
+        return self.config['experience_levels'][level_name]
+
     def calculate_experience_compatibility_score(self, candidate_experience: int,
                                                 internship_experience_req: str = None) -> Tuple[float, str]:
         """Calculate experience compatibility score."""
@@ -498,14 +1264,7 @@ class InternshipRecommendationEngine:
         exp_compat = self.config['experience_compatibility']
 
         # Map years of experience to experience level
-        if candidate_experience <= 1:
-            candidate_level = exp_levels['beginner']
-        elif candidate_experience <= 3:
-            candidate_level = exp_levels['intermediate']
-        elif candidate_experience <= 5:
-            candidate_level = exp_levels['advanced']
-        else:
-            candidate_level = exp_levels['expert']
+        candidate_level = self._candidate_experience_level(candidate_experience)
 
         # Parse internship experience requirements
         if pd.isna(internship_experience_req) or not internship_experience_req:
@@ -517,14 +1276,11 @@ class InternshipRecommendationEngine:
             exp_req_lower = internship_experience_req.lower()
 
             # Map text requirements to levels
-            if any(word in exp_req_lower for word in ['fresher', 'beginner', 'entry', 'no experience']):
-                required_level = exp_levels['beginner']
-            elif any(word in exp_req_lower for word in ['1-3', 'intermediate', 'some experience']):
-                required_level = exp_levels['intermediate']
-            elif any(word in exp_req_lower for word in ['3-5', 'advanced', 'experienced']):
-                required_level = exp_levels['advanced']
-            else:
-                required_level = exp_levels['expert']
+            required_level = exp_levels['expert']
+            for level_name, pattern in _EXPERIENCE_REQUIREMENT_PATTERNS:
+                if pattern.search(exp_req_lower):
+                    required_level = exp_levels[level_name]
+                    break
 
             # Calculate compatibility
             level_diff = candidate_level - required_level
@@ -541,7 +1297,7 @@ class InternshipRecommendationEngine:
 
         return score, reason
 
-    def calculate_diversity_score(self, internship: pd.Series, current_recommendations: List[Dict[str, Any]]) -> float:
+    def calculate_diversity_score(self, internship: Mapping[str, Any], current_recommendations: List[Dict[str, Any]]) -> float:
         """Calculate diversity score based on current recommendations."""
         diversity_config = self.config['diversity']
         scoring_weights = self.config['scoring_weights']
@@ -549,13 +1305,18 @@ class InternshipRecommendationEngine:
         if not current_recommendations:
             return scoring_weights['diversity_bonus']  # Full bonus for first recommendation
 
+        # Stipend overlap is tallied in the same pass as the dimension counts
+        current_stipend = self._parse_stipend_range(internship.get('stipend', ''))
+        check_stipend = bool(current_stipend)
+        stipend_total = 0
+        stipend_overlap = 0
+
         # Count current recommendations by different dimensions
         sector_counts = {}
         location_counts = {}
         organization_counts = {}
-        stipend_ranges = []
 
-        for rec in current_recommendations:
+        for n, rec in enumerate(current_recommendations):
             sector = rec.get('sector_tags', '').lower()
             location = rec.get('location', {}).get('city', '').lower()
             org = rec.get('organization', '').lower()
@@ -565,83 +1326,66 @@ class InternshipRecommendationEngine:
             location_counts[location] = location_counts.get(location, 0) + 1
             organization_counts[org] = organization_counts.get(org, 0) + 1
 
-            if stipend:
-                stipend_ranges.append(self._parse_stipend_range(stipend))
+            if check_stipend and stipend:
+                stipend_range = self._parse_stipend_range(stipend)
+                stipend_total += 1
+                # Check for overlap
+                if stipend_range and current_stipend[0] <= stipend_range[1] and current_stipend[1] >= stipend_range[0]:
+                    stipend_overlap += 1
+
+                # Stop once even all-overlapping remaining stipends could not exceed the 0.7 ratio
+                remaining = len(current_recommendations) - n - 1
+                if (stipend_overlap + remaining) / (stipend_total + remaining) <= 0.7:
+                    check_stipend = False
 
         # Calculate diversity penalties
         diversity_penalty = 0.0
 
         # Sector diversity
-        current_sector = internship.get('sector_tags', '').lower()
+        current_sector = internship['sector_tags_lower']
         sector_count = sector_counts.get(current_sector, 0)
         if sector_count >= diversity_config['max_same_sector']:
             diversity_penalty += diversity_config['sector_diversity_weight']
 
         # Location diversity
-        current_location = internship.get('location_city', '').lower()
+        current_location = internship['location_city_lower']
         location_count = location_counts.get(current_location, 0)
         if location_count >= diversity_config['max_same_location']:
             diversity_penalty += diversity_config['location_diversity_weight']
 
         # Organization diversity
-        current_org = internship.get('organization', '').lower()
+        current_org = internship['organization_lower']
         org_count = organization_counts.get(current_org, 0)
         if org_count >= diversity_config['max_same_org']:
             diversity_penalty += diversity_config['organization_diversity_weight']
 
         # Stipend range diversity (encourage variety in compensation)
-        current_stipend = self._parse_stipend_range(internship.get('stipend', ''))
-        if current_stipend and stipend_ranges:
-            stipend_similarity = 0
-            for stipend_range in stipend_ranges:
-                if stipend_range and current_stipend:
-                    # Check for overlap
-                    if (current_stipend[0] <= stipend_range[1] and current_stipend[1] >= stipend_range[0]):
-                        stipend_similarity += 1
-
-            if stipend_similarity / len(stipend_ranges) > 0.7:  # Too similar stipends
-                diversity_penalty += diversity_config['stipend_range_diversity']
+        if check_stipend and stipend_total and stipend_overlap / stipend_total > 0.7:  # Too similar stipends
+            diversity_penalty += diversity_config['stipend_range_diversity']
 
         # Return diversity bonus (inverse of penalty)
-        return max(0, scoring_weights['diversity_bonus'] - diversity_penalty)
+        diversity_score = scoring_weights['diversity_bonus'] - diversity_penalty
+        return diversity_score if diversity_score > 0 else 0
 
     def apply_fairness_constraints(self, recommendations: List[Dict[str, Any]], candidate: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Apply fairness constraints to ensure equitable recommendations."""
         if not recommendations:
             return recommendations
 
-        # Ensure representation across different dimensions
-        filtered_recs = []
-
-        # Group by key dimensions
-        by_sector = {}
-        by_location = {}
-        by_qualification_level = {}
-
+        # Group by sector in a single pass (sector is the dimension the selection caps)
+        by_sector = defaultdict(list)
         for rec in recommendations:
-            sector = rec.get('sector_tags', '').lower()
-            location = rec.get('location', {}).get('city', '').lower()
-            qual_req = rec.get('eligibility_min_qualification', '').lower()
-
-            if sector not in by_sector:
-                by_sector[sector] = []
-            if location not in by_location:
-                by_location[location] = []
-            if qual_req not in by_qualification_level:
-                by_qualification_level[qual_req] = []
-
-            by_sector[sector].append(rec)
-            by_location[location].append(rec)
-            by_qualification_level[qual_req].append(rec)
+            by_sector[rec.get('sector_tags', '').lower()].append(rec)
 
         # Select diverse recommendations
-        diversity_config = self.config['diversity']
+        max_same_sector = self.config['diversity']['max_same_sector']
+        by_score = operator.itemgetter('final_score')
         selected = []
 
-        # Ensure maximum diversity by taking top from each category
+        # Ensure maximum diversity by taking top from each category (nlargest matches a
+        # stable descending sort truncated to the cap, without sorting the whole sector)
         for sector_recs in by_sector.values():
-            sector_recs.sort(key=lambda x: x.get('final_score', 0), reverse=True)
-            selected.extend(sector_recs[:diversity_config['max_same_sector']])
+            selected.extend(heapq.nlargest(max_same_sector, sector_recs, key=by_score))
 
         # Remove duplicates and ensure we don't exceed limits
         seen_ids = set()
@@ -684,140 +1428,134 @@ class InternshipRecommendationEngine:
         """Provide content-based recommendations for cold start scenarios."""
         logger.info("Using content-based bootstrap for cold start scenario")
 
-        # Filter internships based on basic criteria
-        filtered_internships = []
-
-        for idx, internship in self.internships_df.iterrows():
-            # Basic qualification check (relaxed for cold start)
-            qual_filter = self.config['qualification_filtering']
-            candidate_education = candidate.get('education_level', '')
-            required_qual = internship.get('eligibility_min_qualification', '')
-
-            if candidate_education and required_qual:
-                qual_levels = self.config['qualification_levels']
-                candidate_level = qual_levels.get(candidate_education.lower(), 0)
-                required_level = qual_levels.get(required_qual.lower(), 0)
+        # One automaton per candidate list, so each internship string is scanned once
+        candidate_skills = candidate.get('skills', [])
+        candidate_sectors = candidate.get('preferred_sectors', [])
+        candidate_locations = candidate.get('preferred_locations', [])
+        skill_lower = [skill.lower() for skill in candidate_skills]
+        sector_lower = [sector.lower() for sector in candidate_sectors]
+        location_lower = [location.lower() for location in candidate_locations]
+        skill_automaton = build_automaton(skill_lower)
+        sector_automaton = build_automaton(sector_lower)
+        location_automaton = build_automaton(location_lower)
+
+        # Filter internships based on basic criteria, as boolean masks over all rows
+        keep = np.ones(len(self.internships_df), dtype=bool)
+
+        # Basic qualification check (relaxed for cold start)
+        candidate_education = candidate.get('education_level', '')
+        if candidate_education:
+            candidate_level = self.config['qualification_levels'].get(candidate_education.lower(), 0)
+            has_qualification = self._cols['eligibility_min_qualification_lower'] != ''
+            # Allow some flexibility for cold start: only skip if significantly underqualified
+            keep &= ~(has_qualification & (candidate_level < self._qual_level_arr.astype(np.int64) - 1))
+
+        # Basic skill matching (relaxed); an empty skill is a substring of anything
+        if candidate_skills and '' not in skill_lower:
+            skills_text = self._cols['preferred_skills_lower']
+            skill_match = np.fromiter((contains_any(skill_automaton, text) for text in skills_text),
+                                      dtype=bool, count=len(skills_text))
+            keep &= (skills_text == '') | skill_match
 
-                # Allow some flexibility for cold start
-                if candidate_level < required_level - 1:  # Only skip if significantly underqualified
-                    continue
+        # Score and rank filtered internships
+        positions = np.flatnonzero(keep)[:50]  # Limit for performance
+        scores = np.full(len(positions), 0.5)  # Simple scoring for cold start: base score
 
-            # Basic skill matching (relaxed)
-            candidate_skills = candidate.get('skills', [])
-            internship_skills = internship.get('preferred_skills', '')
+        # Boost for preferred sectors
+        if candidate_sectors:
+            sectors_text = self._cols['sector_tags_lower'][positions]
+            sector_match = np.fromiter(('' in sector_lower or contains_any(sector_automaton, text)
+                                        for text in sectors_text), dtype=bool, count=len(positions))
+            scores = np.where((sectors_text != '') & sector_match, scores + 0.2, scores)
 
-            if candidate_skills and internship_skills:
-                skill_match = False
-                for skill in candidate_skills:
-                    if skill.lower() in internship_skills.lower():
-                        skill_match = True
-                        break
-                if not skill_match:
-                    continue
+        # Boost for location match
+        if candidate_locations:
+            cities_text = self._cols['location_city_lower'][positions]
+            location_match = np.fromiter(('' in location_lower or contains_any(location_automaton, text)
+                                          for text in cities_text), dtype=bool, count=len(positions))
+            scores = np.where((cities_text != '') & location_match, scores + 0.2, scores)
 
-            filtered_internships.append((idx, internship))
+        scored_recommendations = list(zip(scores.tolist(), positions.tolist()))
 
-        # Score and rank filtered internships
-        scored_recommendations = []
-        for idx, internship in filtered_internships[:50]:  # Limit for performance
-            # Simple scoring for cold start
-            score = 0.5  # Base score
-
-            # Boost for preferred sectors
-            candidate_sectors = candidate.get('preferred_sectors', [])
-            internship_sectors = internship.get('sector_tags', '')
-            if candidate_sectors and internship_sectors:
-                for sector in candidate_sectors:
-                    if sector.lower() in internship_sectors.lower():
-                        score += 0.2
-                        break
-
-            # Boost for location match
-            candidate_locations = candidate.get('preferred_locations', [])
-            internship_city = internship.get('location_city', '')
-            if candidate_locations and internship_city:
-                for location in candidate_locations:
-                    if location.lower() in internship_city.lower():
-                        score += 0.2
-                        break
-
-            scored_recommendations.append((score, idx, internship))
-
-        # Sort by score and return top recommendations
-        scored_recommendations.sort(key=lambda x: x[0], reverse=True)
+        # Return top recommendations; nlargest keeps sorted(..., reverse=True) order for ties
+        top_recommendations = heapq.nlargest(top_k, scored_recommendations, key=operator.itemgetter(0))
 
         recommendations = []
-        for score, idx, internship in scored_recommendations[:top_k]:
-            recommendation = self._create_recommendation_dict(internship, score, candidate, {})
+        for score, position in top_recommendations:
+            recommendation = self._create_recommendation_dict(self._row(position), score, candidate, {}, position)
             recommendations.append(recommendation)
 
         return recommendations
 
-    def _create_recommendation_dict(self, internship: pd.Series, score: float,
-                                   candidate: Dict[str, Any], components: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_recommendation_dict(self, internship: Mapping[str, Any], score: float, candidate: Dict[str, Any],
+                                   components: Dict[str, Any], position: int) -> Dict[str, Any]:
         """Create a standardized recommendation dictionary."""
+        base = self._recommendation_bases[position]
+
+        # Matched sectors feed both the match reasons and the explanation text
+        if components.get('sector_relevance', 0) > 0 and 'matched_sectors' not in components:
+            components = {**components,
+                          'matched_sectors': self._components_matched_sectors(components, internship, candidate)}
         return {
-            'internship_id': str(internship.get('internship_id', '')),
-            'title': str(internship.get('title', '')),
-            'organization': str(internship.get('organization', '')),
+            'internship_id': base['internship_id'],
+            'title': base['title'],
+            'organization': base['organization'],
             'score': float(round(score, 3)),
             'match_reasons': self.generate_match_reasons(components, internship, candidate),
             'explain_text': self.generate_explanation_text(internship, components, candidate),
             'scoring_breakdown': self.generate_detailed_scoring_breakdown(components),
-            'location': {
-                'city': str(internship.get('location_city', '')),
-                'district': str(internship.get('location_district', '')),
-                'state': str(internship.get('location_state', ''))
-            },
-            'stipend': str(internship.get('stipend', '')),
-            'duration_weeks': int(internship.get('duration_weeks', 0)),
-            'remote_allowed': str(internship.get('remote_allowed', '')) == 'yes',
-            'application_deadline': str(internship.get('application_deadline', '')),
-            'url': str(internship.get('url', '')),
-            'posted_date': str(internship.get('posted_date', '')),
-            'sector_tags': str(internship.get('sector_tags', '')),
-            'description': str(internship.get('description', '')),
+            'location': dict(base['location']),
+            'stipend': base['stipend'],
+            'duration_weeks': int(base['duration_weeks']),
+            'remote_allowed': base['remote_allowed'],
+            'application_deadline': base['application_deadline'],
+            'url': base['url'],
+            'posted_date': base['posted_date'],
+            'sector_tags': base['sector_tags'],
+            'description': base['description'],
             'final_score': float(score)
         }
 
-    def calculate_location_match_score(self, candidate: Dict[str, Any], internship: pd.Series) -> float:
-        """Calculate location match score with remote preference filtering."""
+    def calculate_location_match_score(self, candidate: Dict[str, Any], internship: Mapping[str, Any],
+                                       candidate_location_set: Optional[frozenset] = None) -> float:
+        """Calculate location match score with remote preference filtering.
+
+        Callers scoring many rows can pass candidate_location_set, the lowercased
+        preferred locations, so it is built once rather than per row.
+        """
         location_scores = self.config['location_scoring']
 
         candidate_locations = candidate.get('preferred_locations', [])
         candidate_remote_ok = candidate.get('remote_ok', False)
+        if candidate_location_set is None:
+            candidate_location_set = frozenset(location.lower() for location in candidate_locations)
 
-        internship_city = internship.get('location_city', '').lower()
-        internship_district = internship.get('location_district', '').lower()
-        internship_state = internship.get('location_state', '').lower()
+        internship_city = internship['location_city_lower']
+        internship_district = internship['location_district_lower']
+        internship_state = internship['location_state_lower']
         internship_remote = internship.get('remote_allowed') == 'yes'
 
+        # Best match among the candidate's locations: exact city, else district, else state
+        # (a location equal to the city never counts as a district or state match)
+        best_score = 0.0
+        found_location_match = False
+        if internship_city in candidate_location_set:
+            best_score = max(best_score, location_scores['exact_city'])
+            found_location_match = True
+        if internship_district in candidate_location_set and internship_district != internship_city:
+            best_score = max(best_score, location_scores['same_district'])
+            found_location_match = True
+        if internship_state in candidate_location_set and internship_state not in (internship_city,
+                                                                                   internship_district):
+            best_score = max(best_score, location_scores['same_state'])
+            found_location_match = True
+
         # If candidate doesn't want remote work, only consider location matches
         if not candidate_remote_ok:
             # If no location preferences specified, give very low score
             if not candidate_locations:
                 return 0.1  # Very low score since they don't want remote and didn't specify locations
 
-            best_score = 0.0
-            found_location_match = False
-
-            # Check for location matches only (no remote fallback)
-            for candidate_location in candidate_locations:
-                candidate_loc_lower = candidate_location.lower()
-
-                # Exact city match
-                if candidate_loc_lower == internship_city:
-                    best_score = max(best_score, location_scores['exact_city'])
-                    found_location_match = True
-                # District match
-                elif candidate_loc_lower == internship_district:
-                    best_score = max(best_score, location_scores['same_district'])
-                    found_location_match = True
-                # State match
-                elif candidate_loc_lower == internship_state:
-                    best_score = max(best_score, location_scores['same_state'])
-                    found_location_match = True
-
             # If no location match found, give very low score (don't recommend)
             if not found_location_match:
                 best_score = 0.1  # Very low score to discourage recommendation
@@ -831,26 +1569,6 @@ class InternshipRecommendationEngine:
                 return location_scores['remote_allowed']
             return 0.5  # Neutral score - not remote but they didn't specify locations
 
-        best_score = 0.0
-        found_location_match = False
-
-        # Check for location matches first
-        for candidate_location in candidate_locations:
-            candidate_loc_lower = candidate_location.lower()
-
-            # Exact city match
-            if candidate_loc_lower == internship_city:
-                best_score = max(best_score, location_scores['exact_city'])
-                found_location_match = True
-            # District match
-            elif candidate_loc_lower == internship_district:
-                best_score = max(best_score, location_scores['same_district'])
-                found_location_match = True
-            # State match
-            elif candidate_loc_lower == internship_state:
-                best_score = max(best_score, location_scores['same_state'])
-                found_location_match = True
-
         # If no location match found, check remote option
         if not found_location_match and internship_remote:
             best_score = location_scores['no_match_remote_ok']
@@ -861,14 +1579,11 @@ class InternshipRecommendationEngine:
 
         return best_score
 
-    def calculate_sector_relevance_score(self, candidate_sectors: List[str], internship_sectors: str) -> float:
-        """Calculate sector relevance score."""
-        if not candidate_sectors or pd.isna(internship_sectors):
+    def calculate_sector_relevance_score(self, candidate_sectors: List[str], internship_sector_list: List[str]) -> float:
+        """Calculate sector relevance score against pre-tokenized internship sectors."""
+        if not candidate_sectors or not internship_sector_list:
             return 0.5  # Neutral score
 
-        # Parse internship sectors (comma-separated)
-        internship_sector_list = [sector.strip().lower() for sector in internship_sectors.split(',')]
-
         matches = 0
         for candidate_sector in candidate_sectors:
             candidate_sector_lower = candidate_sector.lower()
@@ -914,52 +1629,195 @@ class InternshipRecommendationEngine:
             stipend_str = str(stipend_str.item())
         else:
             stipend_str = str(stipend_str)
+        return _parse_stipend_range_cached(stipend_str)
 
-        if pd.isna(stipend_str) or stipend_str == '0' or stipend_str.strip() == '':
-            return None
-
-        # Handle ranges like "5000-8000"
-        if '-' in stipend_str:
-            parts = stipend_str.split('-')
-            try:
-                min_val = int(parts[0].strip())
-                max_val = int(parts[1].strip())
-                return (min_val, max_val)
-            except ValueError:
-                return None
-
-        # Handle single values
-        try:
-            value = int(stipend_str.strip())
-            return (value, value)
-        except ValueError:
-            return None
-
-    def calculate_recency_score(self, posted_date: str) -> float:
+    def calculate_recency_score(self, posted_date: str, today: Optional[str] = None) -> float:
         """Calculate recency score based on posting date."""
         if pd.isna(posted_date):
             return 0.5  # Neutral score
 
-        try:
-            posted = datetime.strptime(posted_date, '%Y-%m-%d')
-            days_since = (datetime.now() - posted).days
+        # Pass one ISO date per recommendation batch so cached day counts stay consistent
+        days_since = _days_since_posted(posted_date, today or date.today().isoformat())
+        if days_since is None:
+            return 0.5
 
-            recency_config = self.config['recency_scoring']
+        recency_config = self.config['recency_scoring']
 
-            if days_since <= 7:
-                return recency_config['very_recent']
-            elif days_since <= 30:
-                return recency_config['recent']
-            elif days_since <= 90:
-                return recency_config['moderate']
-            else:
-                return recency_config['old']
-        except ValueError:
-            return 0.5
+        if days_since <= 7:
+            return recency_config['very_recent']
+        elif days_since <= 30:
+            return recency_config['recent']
+        elif days_since <= 90:
+            return recency_config['moderate']
+        else:
+            return recency_config['old']
+
+    def calculate_qualification_fit_scores(self, candidate_education: str, positions: np.ndarray,
+                                           candidate_experience: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized calculate_qualification_fit_score using qualification levels mapped at load time."""
+        if not candidate_education:
+            return np.full(len(positions), 0.5), np.full(len(positions), 'qualification_unknown', dtype=object)
+
+        qual_levels = self.config['qualification_levels']
+        qual_compat = self.config['qualification_compatibility']
+        qual_filter = self.config['qualification_filtering']
+        candidate_experience = candidate_experience or 0
+
+        candidate_level = qual_levels.get(candidate_education.lower(), 0)
+        level_diff = candidate_level - self._qual_level_arr[positions].astype(np.int64)
+
+        # Calculate compatibility score
+        scores = np.select([level_diff == 0, level_diff > 0],
+                           [qual_compat['exact'] * qual_filter['exact_match_bonus'], qual_compat['higher']],
+                           default=qual_compat['lower'])
+        reasons = np.select([level_diff == 0, level_diff > 0], ['exact_match', 'higher_qualification'],
+                            default='lower_qualification').astype(object)
+
+        # Experience compensation for qualification gaps
+        if qual_filter['experience_override']:
+            experience_bonus = min(candidate_experience * 0.1, 0.3)  # Max 30% bonus
+            scores = np.where(level_diff != 0, np.minimum(scores + experience_bonus, 1.0), scores)
+
+        # Strict qualification filtering
+        if qual_filter['strict_mode']:
+            underqualified = (level_diff < 0) & (not qual_filter['allow_lower_qual'])
+            overqualified = (level_diff > 0) & (not qual_filter['allow_higher_qual']) & \
+                (not (qual_filter['experience_override'] and candidate_experience >= 2))
+            scores = np.where(underqualified | overqualified, 0.0, scores)
+            reasons = np.where(underqualified, 'underqualified', np.where(overqualified, 'overqualified', reasons))
+
+        missing = self._qual_missing[positions]
+        return np.where(missing, 0.5, scores), np.where(missing, 'qualification_unknown', reasons)
+
+    def calculate_experience_compatibility_scores(self, candidate_experience: int,
+                                                  positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized calculate_experience_compatibility_score using requirement categories parsed at load time."""
+        if candidate_experience is None:
+            candidate_experience = 0
+
+        exp_compat = self.config['experience_compatibility']
+
+        # Map years of experience to experience level
+        candidate_level = self._candidate_experience_level(candidate_experience)
+
+        # Category 0 (no requirement stated) is treated as beginner friendly
+        category = self._experience_req_arr[positions]
+        level_diff = candidate_level - self._experience_req_level[positions]
+
+        conditions = [category == 0, level_diff == 0, level_diff > 0]
+        scores = np.select(conditions, [exp_compat['exact'] * exp_compat['beginner_boost'], exp_compat['exact'],
+                                        exp_compat['higher']], default=exp_compat['lower'])
+        reasons = np.select(conditions, ['beginner_friendly', 'experience_match', 'more_experienced'],
+                            default='less_experienced').astype(object)
+        return scores, reasons
+
+    def calculate_sector_relevance_scores(self, candidate_sectors: List[str], positions: np.ndarray) -> np.ndarray:
+        """Vectorized calculate_sector_relevance_score using the sector inverted index."""
+        if not candidate_sectors:
+            return np.full(len(positions), 0.5)
+
+        # Count, per internship, the candidate sectors with an exact or partial sector match
+        matches = np.zeros(len(self.internships_df), dtype=np.int64)
+        for candidate_sector in candidate_sectors:
+            candidate_sector_lower = candidate_sector.lower()
+            matched = np.zeros(len(self.internships_df), dtype=bool)
+            for internship_sector, ids in self._sector_to_ids.items():
+                if candidate_sector_lower in internship_sector or internship_sector in candidate_sector_lower:
+                    matched[ids] = True
+            matches += matched
+
+        # Return score based on match ratio
+        return np.where(self._sector_empty[positions], 0.5, matches[positions] / len(candidate_sectors))
+
+    def score_all_internships(self, candidate: Dict[str, Any],
+                              positions: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """Score every row-independent component for many internships at once.
+
+        Returns one array per component (plus qualification and experience reasons) aligned
+        with positions, or with the whole dataset when positions is None.
+        """
+        if positions is None:
+            positions = np.arange(len(self.internships_df))
+
+        candidate_experience = candidate.get('years_of_experience', 0)
+        qual_scores, qual_reasons = self.calculate_qualification_fit_scores(
+            candidate.get('education_level', ''), positions, candidate_experience)
+        exp_scores, exp_reasons = self.calculate_experience_compatibility_scores(candidate_experience, positions)
+
+        return {
+            'qualification_fit': qual_scores,
+            'qualification_reason': qual_reasons,
+            'experience_compatibility': exp_scores,
+            'experience_reason': exp_reasons,
+            'location_match': self.calculate_location_match_scores(candidate, positions),
+            'sector_relevance': self.calculate_sector_relevance_scores(candidate.get('preferred_sectors', []),
+                                                                       positions),
+            'stipend_match': self.calculate_stipend_match_scores(candidate.get('stipend_pref', ''), positions),
+            'recency': self.calculate_recency_scores(positions)
+        }
+
+    def calculate_location_match_scores(self, candidate: Dict[str, Any], positions: np.ndarray) -> np.ndarray:
+        """Vectorized calculate_location_match_score for internship row positions."""
+        location_scores = self.config['location_scoring']
 
-    def calculate_combined_score(self, embedding_score: float, internship: pd.Series,
-                                candidate: Dict[str, Any], current_recommendations: List[Dict[str, Any]] = None) -> Tuple[float, Dict[str, Any]]:
-        """Calculate combined score with enhanced rule-based features."""
+        candidate_locations = candidate.get('preferred_locations', [])
+        candidate_remote_ok = candidate.get('remote_ok', False)
+        internship_remote = self._remote[positions]
+
+        if not candidate_locations:
+            if not candidate_remote_ok:
+                return np.full(len(positions), 0.1)
+            return np.where(internship_remote, location_scores['remote_allowed'], 0.5)
+
+        cities, districts, states = self._city_ids[positions], self._district_ids[positions], self._state_ids[positions]
+        best_score = np.zeros(len(positions))
+        found_location_match = np.zeros(len(positions), dtype=bool)
+
+        for candidate_location in candidate_locations:
+            # Locations absent from the dataset map to -1 and match nothing
+            location_id = self._location_vocab.get(candidate_location.lower(), -1)
+            city_match = cities == location_id
+            district_match = ~city_match & (districts == location_id)
+            state_match = ~city_match & ~district_match & (states == location_id)
+            score = np.select([city_match, district_match, state_match],
+                              [location_scores['exact_city'], location_scores['same_district'],
+                               location_scores['same_state']], default=0.0)
+            best_score = np.maximum(best_score, score)
+            found_location_match |= city_match | district_match | state_match
+
+        if not candidate_remote_ok:
+            # No location match gets a very low score to discourage recommendation
+            return np.where(found_location_match, best_score, 0.1)
+
+        best_score = np.where(~found_location_match & internship_remote,
+                              location_scores['no_match_remote_ok'], best_score)
+        return np.where(best_score == 0.0, location_scores['different_state'], best_score)
+
+    def calculate_stipend_match_scores(self, candidate_stipend_pref: str, positions: np.ndarray) -> np.ndarray:
+        """Vectorized calculate_stipend_match_score using stipend ranges parsed at load time."""
+        stipend_scores = self.config['stipend_scoring']
+        candidate_range = self._parse_stipend_range(candidate_stipend_pref) if candidate_stipend_pref else None
+        if not candidate_range:
+            return np.full(len(positions), stipend_scores['no_preference'])
+
+        overlap = (candidate_range[0] <= self._stipend_high[positions]) & \
+            (candidate_range[1] >= self._stipend_low[positions])
+        return np.select([self._stipend_unparsed[positions], overlap],
+                         [stipend_scores['no_preference'], stipend_scores['within_range']], default=0.3)
+
+    def calculate_recency_scores(self, positions: np.ndarray) -> np.ndarray:
+        """Vectorized calculate_recency_score using posting dates parsed at load time."""
+        recency_config = self.config['recency_scoring']
+        posted = self._posted[positions]
+        days_since = (np.datetime64(date.today(), 'D') - posted).astype(np.int64)  # NaT rows are masked below
+
+        scores = np.select([days_since <= 7, days_since <= 30, days_since <= 90],
+                           [recency_config['very_recent'], recency_config['recent'], recency_config['moderate']],
+                           default=recency_config['old'])
+        return np.where(np.isnat(posted), 0.5, scores)
+
+    def _scoring_weights(self, candidate: Dict[str, Any]) -> Dict[str, float]:
+        """Scoring weights for a candidate, adjusted for their remote preference."""
         weights = self.config['scoring_weights'].copy()  # Create a copy to modify
 
         # Adjust location weight based on remote preference
@@ -976,49 +1834,141 @@ class InternshipRecommendationEngine:
                 if k != 'location_match':
                     weights[k] *= reduction_factor
 
-        # Normalize embedding score (FAISS returns inner product, higher is better)
+        return weights
+
+    @staticmethod
+    def _normalize_embedding_score(embedding_score: float) -> float:
+        """Map a FAISS cosine similarity onto [0, 1]."""
         # Use a more appropriate normalization based on observed score ranges
-        # Scores typically range from ~0.8 to 1.1 for this dataset
-        normalized_embedding = (embedding_score - 0.8) / 0.3  # Normalize to 0-1 range
-        normalized_embedding = max(0.0, min(1.0, normalized_embedding))  # Clamp to [0,1]
+        # Scores typically range from ~0.3 to 0.8 for this dataset
+        normalized_embedding = (embedding_score - 0.3) / 0.5  # Normalize to 0-1 range
+        # Clamp to [0,1]
+        return 0.0 if normalized_embedding <= 0.0 else \
+            1.0 if normalized_embedding >= 1.0 else normalized_embedding
+
+    def calculate_combined_scores(self, embedding_scores: np.ndarray, positions: np.ndarray,
+                                  candidate: Dict[str, Any], component_scores: Optional[Dict[str, np.ndarray]] = None
+                                  ) -> Tuple[np.ndarray, Dict[str, List[Any]]]:
+        """Batched calculate_combined_score for the internships at positions, in retrieval order.
+
+        component_scores are the score_all_internships arrays for positions (computed if not
+        given). Returns the final scores and the per-row components as lists aligned with positions;
+        the final scores are a single (rows x components) @ weights product.
+        """
+        if component_scores is None:
+            component_scores = self.score_all_internships(candidate, positions)
+        weights = self._scoring_weights(candidate)
+
+        # Skill scores: the full scorer only runs where the coarse stage finds a matching skill pair
+        candidate_skills = candidate.get('skills', [])
+        candidate_key = tuple(candidate_skills[:self.config['skill_scoring']['max_skills']])
+        internship_ids, skill_tokens = self._cols['internship_id'], self._cols['preferred_skills_tokens']
+        score_skills, score_unmatched = self._internship_skill_score, self._unmatched_skill_score
+        skill_results = []
+        for position, skill_hit in zip(positions.tolist(), self._skill_hit_mask(candidate_skills, positions).tolist()):
+            if skill_hit:
+                skill_results.append(score_skills(candidate_key, internship_ids[position]))
+            else:
+                skill_results.append(score_unmatched(candidate_skills, skill_tokens[position]))
+
+        # Diversity depends only on the internships before each one in retrieval order
+        diversity = DiversityTracker(self, len(positions))
+        diversity_scores = []
+        for position in positions.tolist():
+            diversity_scores.append(diversity.diversity_score(position))
+            diversity.add(position)
+
+        components = {
+            'embedding_similarity': [self._normalize_embedding_score(score) for score in embedding_scores],
+            'skill_overlap': [skill_score for skill_score, _ in skill_results],
+            'qualification_fit': component_scores['qualification_fit'].tolist(),
+            'experience_compatibility': component_scores['experience_compatibility'].tolist(),
+            'location_match': component_scores['location_match'].tolist(),
+            'sector_relevance': component_scores['sector_relevance'].tolist(),
+            'stipend_match': component_scores['stipend_match'].tolist(),
+            'recency': component_scores['recency'].tolist(),
+            'diversity_bonus': diversity_scores,
+            'skill_details': [skill_details for _, skill_details in skill_results],
+            'qualification_reason': component_scores['qualification_reason'].tolist(),
+            'experience_reason': component_scores['experience_reason'].tolist()
+        }
+
+        # Weighted sum as one matrix-vector product over the stacked component columns
+        component_matrix = np.array([components[name] for name in SCORE_COMPONENTS], dtype=np.float64).T
+        component_matrix[:, SCORE_COMPONENTS.index('skill_overlap')] /= self.config['skill_scoring']['exact_match']
+        final_scores = component_matrix @ np.array([weights[name] for name in SCORE_COMPONENTS], dtype=np.float64)
+        # Drop summation-order rounding noise so equal scores tie exactly (ties then keep retrieval
+        # order) and the 3-decimal display score does not depend on how the sum was evaluated
+        return np.round(final_scores, 12), components
+
+    def calculate_combined_score(self, embedding_score: float, internship: Mapping[str, Any],
+                                candidate: Dict[str, Any], current_recommendations: List[Dict[str, Any]] = None,
+                                precomputed: Optional[Dict[str, float]] = None) -> Tuple[float, Dict[str, Any]]:
+        """Calculate combined score with enhanced rule-based features.
+
+        Components already computed in bulk by score_all_internships can be passed in
+        precomputed to skip their per-row calculation.
+        """
+        precomputed = precomputed or {}
+        weights = self._scoring_weights(candidate)
+        normalized_embedding = self._normalize_embedding_score(embedding_score)
 
         # Calculate individual component scores with enhanced methods
         # Use domain-aligned skill scoring
-        skill_score, skill_details = self.calculate_domain_aligned_skill_score(
-            candidate.get('skills', []),
-            internship.get('preferred_skills', '')
-        )
+        # Only the first max_skills skills are scored, so they alone form the cache key
+        candidate_skills = candidate.get('skills', [])
+        if internship.get('internship_id') in self._id_to_position:
+            skill_score, skill_details = self._internship_skill_score(
+                tuple(candidate_skills[:self.config['skill_scoring']['max_skills']]), internship['internship_id'])
+        else:
+            skill_score, skill_details = self.calculate_domain_aligned_skill_score(
+                candidate_skills,
+                internship.get('preferred_skills_tokens', []),
+                internship.get('preferred_skills_ids')
+            )
 
         # Use enhanced qualification fit with experience consideration
         candidate_experience = candidate.get('years_of_experience', 0)
-        qual_score, qual_reason = self.calculate_qualification_fit_score(
-            candidate.get('education_level', ''),
-            internship.get('eligibility_min_qualification', ''),
-            candidate_experience
-        )
+        if 'qualification_fit' in precomputed:
+            qual_score, qual_reason = precomputed['qualification_fit'], precomputed['qualification_reason']
+        else:
+            qual_score, qual_reason = self.calculate_qualification_fit_score(
+                candidate.get('education_level', ''),
+                internship.get('eligibility_min_qualification', ''),
+                candidate_experience
+            )
 
         # Calculate experience compatibility
-        exp_score, exp_reason = self.calculate_experience_compatibility_score(
-            candidate_experience,
-            internship.get('experience_required', None)
-        )
+        if 'experience_compatibility' in precomputed:
+            exp_score, exp_reason = precomputed['experience_compatibility'], precomputed['experience_reason']
+        else:
+            exp_score, exp_reason = self.calculate_experience_compatibility_score(
+                candidate_experience,
+                internship.get('experience_required', None)
+            )
 
-        location_score = self.calculate_location_match_score(candidate, internship)
+        location_score = precomputed['location_match'] if 'location_match' in precomputed \
+            else self.calculate_location_match_score(candidate, internship)
 
-        sector_score = self.calculate_sector_relevance_score(
-            candidate.get('preferred_sectors', []),
-            internship.get('sector_tags', '')
-        )
+        sector_score = precomputed['sector_relevance'] if 'sector_relevance' in precomputed \
+            else self.calculate_sector_relevance_score(candidate.get('preferred_sectors', []),
+                                                       internship.get('sector_tags_tokens', []))
 
-        stipend_score = self.calculate_stipend_match_score(
-            candidate.get('stipend_pref', ''),
-            internship.get('stipend', '')
-        )
+        stipend_score = precomputed['stipend_match'] if 'stipend_match' in precomputed \
+            else self.calculate_stipend_match_score(candidate.get('stipend_pref', ''), internship.get('stipend', ''))
 
-        recency_score = self.calculate_recency_score(internship.get('posted_date', ''))
+        if 'recency' in precomputed:
+            recency_score = precomputed['recency']
+        elif internship.get('internship_id') in self._id_to_position:
+            # Dataset rows use the posting dates parsed at load time
+            recency_score = self.calculate_recency_scores(
+                np.array([self._id_to_position[internship['internship_id']]])).item()
+        else:
+            recency_score = self.calculate_recency_score(internship.get('posted_date', ''))
 
         # Calculate diversity score
-        diversity_score = self.calculate_diversity_score(internship, current_recommendations or [])
+        diversity_score = precomputed['diversity_bonus'] if 'diversity_bonus' in precomputed \
+            else self.calculate_diversity_score(internship, current_recommendations or [])
 
         # Calculate weighted sum with new components
         final_score = (
@@ -1051,7 +2001,7 @@ class InternshipRecommendationEngine:
 
         return final_score, components
 
-    def generate_match_reasons(self, components: Dict[str, Any], internship: pd.Series, candidate: Dict[str, Any]) -> List[str]:
+    def generate_match_reasons(self, components: Dict[str, Any], internship: Mapping[str, Any], candidate: Dict[str, Any]) -> List[str]:
         """Generate enhanced human-readable match reasons with domain awareness."""
         reasons = []
 
@@ -1084,22 +2034,12 @@ class InternshipRecommendationEngine:
 
         # Qualification - Always show education match information
         qual_reason = components.get('qualification_reason', 'qualification_fit')
-        qual_mapping = {
-            0.3: 'basic fit',
-            0.8: 'good fit',
-            1.0: 'perfect fit',
-            'exact_match': 'exact match',
-            'higher_qualification': 'higher qualification',
-            'lower_qualification': 'lower qualification',
-            'underqualified': 'underqualified',
-            'overqualified': 'overqualified'
-        }
-
-        fit_level = qual_mapping.get(qual_reason, qual_mapping.get(components['qualification_fit'], 'partial fit'))
+        fit_level = _QUALIFICATION_REASON_LABELS.get(qual_reason) or \
+            _QUALIFICATION_FIT_LABELS.get(components.get('qualification_fit', 0), 'partial fit')
         candidate_qual = candidate.get('education_level', 'unknown')
         required_qual = internship.get('eligibility_min_qualification', 'unknown')
 
-        if qual_reason in ['underqualified', 'overqualified']:
+        if qual_reason in ('underqualified', 'overqualified'):
             reasons.append(f"⚠️ Qualification: {fit_level} ({candidate_qual} vs required {required_qual})")
         else:
             reasons.append(f"Education: {fit_level} ({candidate_qual} → {required_qual})")
@@ -1107,28 +2047,13 @@ class InternshipRecommendationEngine:
         # Experience compatibility
         if components.get('experience_compatibility', 0) > 0:
             exp_reason = components.get('experience_reason', 'experience_match')
-            exp_mapping = {
-                'beginner_friendly': 'beginner friendly',
-                'experience_match': 'experience level matches',
-                'more_experienced': 'more experienced than required',
-                'less_experienced': 'less experienced (learning opportunity)'
-            }
-            exp_level = exp_mapping.get(exp_reason, 'experience compatible')
+            exp_level = _EXPERIENCE_REASON_LABELS.get(exp_reason, 'experience compatible')
             reasons.append(f"Experience: {exp_level}")
 
         # Location - Only show if there's a meaningful match
         location_score = components.get('location_match', 0)
         if location_score > 0.5:  # Only show for good matches
-            location_mapping = {
-                0.3: 'different state',
-                0.7: 'same state', 
-                0.9: 'same district',
-                1.0: 'same city',
-                0.8: 'remote available',
-                0.6: 'remote option available',
-                0.4: 'flexible remote work'
-            }
-            location_match = location_mapping.get(location_score, 'location match')
+            location_match = _LOCATION_MATCH_LABELS.get(location_score, 'location match')
             reasons.append(f"Location: {location_match}")
         elif location_score > 0 and location_score <= 0.5:
             # For low scores, show a warning that location doesn't match well
@@ -1136,12 +2061,9 @@ class InternshipRecommendationEngine:
 
         # Sector Relevance
         if components.get('sector_relevance', 0) > 0:
-            candidate_sectors = candidate.get('preferred_sectors', [])
-            internship_sectors = internship.get('sector_tags', '')
-            if candidate_sectors and internship_sectors:
-                matched_sectors = self._get_matched_sectors(candidate_sectors, internship_sectors)
-                if matched_sectors:
-                    reasons.append(f"Sectors: {', '.join(matched_sectors[:2])}")
+            matched_sectors = self._components_matched_sectors(components, internship, candidate)
+            if matched_sectors:
+                reasons.append(f"Sectors: {', '.join(matched_sectors[:2])}")
 
         # Diversity bonus
         if components.get('diversity_bonus', 0) > 0:
@@ -1155,7 +2077,7 @@ class InternshipRecommendationEngine:
 
         return reasons
 
-    def generate_explanation_text(self, internship: pd.Series, components: Dict[str, float], candidate: Dict[str, Any]) -> str:
+    def generate_explanation_text(self, internship: Mapping[str, Any], components: Dict[str, float], candidate: Dict[str, Any]) -> str:
         """Generate a human-readable explanation."""
         explanations = []
 
@@ -1165,7 +2087,14 @@ class InternshipRecommendationEngine:
         explanations.append(f"This {title} position at {org} is recommended because:")
 
         # Skills explanation - Always show if there are matched skills
-        matched_skills = self._get_matched_skills(candidate.get('skills', []), internship.get('preferred_skills', ''))
+        if internship.get('internship_id') in self._id_to_position:
+            matched_skills = self._internship_matched_skills(tuple(candidate.get('skills', [])),
+                                                             internship['internship_id'])
+        else:
+            matched_skills = self._get_matched_skills(candidate.get('skills', []),
+                                                      internship.get('preferred_skills_tokens', []),
+                                                      internship.get('preferred_skills_set'),
+                                                      internship.get('preferred_skills_ids'))
         if matched_skills:
             skill_text = ', '.join(matched_skills[:3])
             explanations.append(f"- Your skills ({skill_text}) match the job requirements")
@@ -1173,36 +2102,26 @@ class InternshipRecommendationEngine:
             explanations.append(f"- Your technical skills align well with the role requirements")
 
         # Qualification explanation - Always show education information
-        candidate_qual = candidate.get('education_level', 'your education')
-        required_qual = internship.get('eligibility_min_qualification', 'unknown')
-        qual_fit = components.get('qualification_fit', 0)
-        
-        if qual_fit >= 0.8:
-            explanations.append(f"- Your {candidate_qual} qualification is an excellent match for this position")
-        elif qual_fit >= 0.3:
-            explanations.append(f"- Your {candidate_qual} qualification meets the requirements (position requires {required_qual})")
-        else:
-            explanations.append(f"- Your {candidate_qual} qualification is compatible with this {required_qual} position")
+        explanations.append(_tier_template(_QUALIFICATION_EXPLANATIONS, components.get('qualification_fit', 0)).format(
+            candidate_qual=candidate.get('education_level', 'your education'),
+            required_qual=internship.get('eligibility_min_qualification', 'unknown')
+        ))
 
         # Location explanation
-        if components['location_match'] >= 0.9:
-            city = internship.get('location_city', '')
-            explanations.append(f"- The location ({city}) perfectly matches your preferences")
-        elif components['location_match'] >= 0.7:
-            state = internship.get('location_state', '')
-            explanations.append(f"- The location is in {state}, which aligns with your preferences")
-        elif components['location_match'] >= 0.4:
-            explanations.append(f"- Remote work options make this accessible from your location")
+        location_template = _tier_template(_LOCATION_EXPLANATIONS, components.get('location_match', 0))
+        if location_template:
+            explanations.append(location_template.format(city=internship.get('location_city', ''),
+                                                          state=internship.get('location_state', '')))
 
         # Sector explanation
-        if components['sector_relevance'] > 0:
-            matched_sectors = self._get_matched_sectors(candidate.get('preferred_sectors', []), internship.get('sector_tags', ''))
+        if components.get('sector_relevance', 0) > 0:
+            matched_sectors = self._components_matched_sectors(components, internship, candidate)
             if matched_sectors:
                 sector_text = ', '.join(matched_sectors[:2])
                 explanations.append(f"- The role is in {sector_text}, matching your career interests")
 
         # Overall profile match
-        if components['embedding_similarity'] > 0.7:
+        if components.get('embedding_similarity', 0) > 0.7:
             explanations.append(f"- Your overall profile and career goals align exceptionally well with this opportunity")
 
         if not explanations[1:]:  # Only the title
@@ -1212,51 +2131,71 @@ class InternshipRecommendationEngine:
 
     def generate_detailed_scoring_breakdown(self, components: Dict[str, Any]) -> Dict[str, Any]:
         """Generate detailed scoring breakdown for transparency."""
-        weights = self.config['scoring_weights']
+        weights = self._breakdown_weights
 
         # Only use components that have corresponding weights
-        weighted_components = {k: v for k, v in components.items()
-                             if k in weights and isinstance(v, (int, float))}
+        names = [k for k, v in components.items() if k in weights and isinstance(v, (int, float))]
+        raw_scores = np.array([components[name] for name in names], dtype=np.float64)
+        weight_vec = np.array([weights[name] for name in names], dtype=np.float64)
+
+        # Weighted contributions and their share of the overall score in one pass each
+        contributions = raw_scores * weight_vec
+        overall_score = float(sum(contributions.tolist()))
+        if overall_score > 0:
+            percentages = contributions / overall_score * 100
+        else:
+            percentages = np.zeros(len(names))
 
-        overall_score = float(sum(weighted_components[comp] * weights[comp]
-                                 for comp in weighted_components.keys()))
         breakdown = {
             'overall_score': overall_score,
-            'component_scores': {},
-            'weights_used': {k: float(v) for k, v in weights.items()},
+            'component_scores': {
+                name: {'raw_score': raw, 'weight': weight, 'contribution': contribution,
+                       'percentage': round(percentage, 1)}
+                for name, raw, weight, contribution, percentage in zip(
+                    names, raw_scores.tolist(), weight_vec.tolist(), contributions.tolist(), percentages.tolist())
+            },
+            'weights_used': dict(weights),
             'recommendation_strength': 'Low'
         }
 
-        # Calculate weighted contribution of each component
-        for component, score in weighted_components.items():
-            weight = float(weights[component])
-            contribution = float(score * weight)
-            percentage = float((contribution / breakdown['overall_score']) * 100 if breakdown['overall_score'] > 0 else 0)
-
-            breakdown['component_scores'][component] = {
-                'raw_score': float(score),
-                'weight': weight,
-                'contribution': contribution,
-                'percentage': float(round(percentage, 1))
-            }
-
         # Determine recommendation strength
-        overall_score = breakdown['overall_score']
-        if overall_score >= 0.8:
-            breakdown['recommendation_strength'] = 'Excellent'
-        elif overall_score >= 0.6:
-            breakdown['recommendation_strength'] = 'Very Good'
-        elif overall_score >= 0.4:
-            breakdown['recommendation_strength'] = 'Good'
-        elif overall_score >= 0.2:
-            breakdown['recommendation_strength'] = 'Fair'
-        else:
-            breakdown['recommendation_strength'] = 'Low'
+        breakdown['recommendation_strength'] = _STRENGTH_LABELS[bisect.bisect_right(_STRENGTH_BOUNDS, overall_score)]
 
         return breakdown
 
-    def recommend(self, candidate: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Enhanced main recommendation method with cold start handling and diversity."""
+    def recommend_batch(self, candidates: List[Dict[str, Any]], n_jobs: int = 1) -> List[List[Dict[str, Any]]]:
+        """Recommendations for many candidates, e.g. a nightly recompute for every user.
+
+        All profile texts are encoded in one batched model call. With n_jobs > 1 the
+        candidates are ranked on a thread pool; FAISS search and the NumPy scorers release
+        the GIL for much of their work, and the engine's caches are shared between threads.
+        """
+        bootstrap_threshold = self.config['cold_start']['profile_bootstrap_threshold']
+        profile_texts = [self.create_candidate_profile_text(candidate)
+                         if self.assess_profile_completeness(candidate) >= bootstrap_threshold else None
+                         for candidate in candidates]
+
+        # Encode each distinct profile text once (cold start candidates need no embedding)
+        unique_texts = list(dict.fromkeys(text for text in profile_texts if text is not None))
+        embeddings = {}
+        if unique_texts:
+            encoded = np.asarray(self.model.encode(unique_texts, batch_size=64), dtype=np.float32)
+            embeddings = dict(zip(unique_texts, encoded))
+        candidate_embeddings = [embeddings.get(text) for text in profile_texts]
+
+        if n_jobs <= 1:
+            return [self.recommend(candidate, embedding)
+                    for candidate, embedding in zip(candidates, candidate_embeddings)]
+
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            return list(executor.map(self.recommend, candidates, candidate_embeddings))
+
+    def recommend(self, candidate: Dict[str, Any],
+                  candidate_embedding: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """Enhanced main recommendation method with cold start handling and diversity.
+
+        A precomputed profile embedding (see recommend_batch) skips encoding the profile text.
+        """
         logger.info("Generating enhanced recommendations for candidate...")
 
         # Assess profile completeness for cold start decision
@@ -1272,46 +2211,40 @@ class InternshipRecommendationEngine:
 
         # Standard recommendation pipeline for complete profiles
         # Create candidate profile text and embedding
-        profile_text = self.create_candidate_profile_text(candidate)
-        candidate_embedding = self.model.encode([profile_text])[0]
+        if candidate_embedding is None:
+            profile_text = self.create_candidate_profile_text(candidate)
+            candidate_embedding = self._embed_profile_text(profile_text)
 
         # Retrieve similar internships (increased retrieval for better diversity)
-        scores, indices = self.retrieve_similar_internships(candidate_embedding, self.config['top_k_final'])
+        scores, indices = self.retrieve_similar_internships(candidate_embedding, self.config['top_k_final'], candidate)
 
-        # Calculate combined scores with diversity consideration
-        recommendations = []
-        current_recommendations = []  # Track current recommendations for diversity scoring
-
-        for score, idx in zip(scores, indices):
-            if idx >= len(self.internships_df):
-                continue
+        # Score the row-independent components for all retrieved internships at once
+        valid = indices < len(self.internships_df)
+        scores, indices = scores[valid], indices[valid]
+        component_scores = self.score_all_internships(candidate, indices)
 
-            internship = self.internships_df.iloc[idx]
+        # Skip if qualification filtering eliminated this candidate
+        keep = component_scores['qualification_fit'] != 0.0
 
-            # Calculate combined score with diversity awareness
-            final_score, components = self.calculate_combined_score(
-                score, internship, candidate, current_recommendations
-            )
+        # Skip if location doesn't match and user doesn't want remote work
+        if not candidate.get('remote_ok', False) and candidate.get('preferred_locations', []):
+            keep &= component_scores['location_match'] >= 0.3
 
-            # Skip if qualification filtering eliminated this candidate
-            if components.get('qualification_fit', 1.0) == 0.0:
-                continue
+        scores, indices = scores[keep], indices[keep]
+        component_scores = {name: values[keep] for name, values in component_scores.items()}
 
-            # Skip if location doesn't match and user doesn't want remote work
-            candidate_remote_ok = candidate.get('remote_ok', False)
-            candidate_locations = candidate.get('preferred_locations', [])
-            location_score = components.get('location_match', 0)
-            
-            if not candidate_remote_ok and candidate_locations and location_score < 0.3:
-                # User doesn't want remote and location doesn't match well - skip this recommendation
-                continue
+        # Calculate combined scores with diversity consideration
+        final_scores, components = self.calculate_combined_scores(scores, indices, candidate, component_scores)
 
-            recommendation = self._create_recommendation_dict(internship, final_score, candidate, components)
-            recommendations.append(recommendation)
-            current_recommendations.append(recommendation)
+        # Rank lightweight records; explanations are only built for the results actually returned
+        recommendations = []
+        for i, (final_score, idx) in enumerate(zip(final_scores.tolist(), indices.tolist())):
+            base = self._recommendation_bases[idx]
+            recommendations.append({'internship_id': base['internship_id'], 'sector_tags': base['sector_tags'],
+                                    'final_score': final_score, 'row': i})
 
-        # Sort by enhanced score
-        recommendations.sort(key=lambda x: x['final_score'], reverse=True)
+        # Sort by enhanced score; exact ties keep retrieval order
+        recommendations.sort(key=lambda x: (-x['final_score'], x['row']))
 
         # Apply diversity and fairness constraints
         diverse_recommendations = self.apply_fairness_constraints(recommendations, candidate)
@@ -1320,10 +2253,16 @@ class InternshipRecommendationEngine:
         max_results = self.config['recommendation']['max_results']
         min_threshold = self.config['recommendation']['min_score_threshold']
 
-        filtered_recommendations = [
-            rec for rec in diverse_recommendations
-            if rec['final_score'] >= min_threshold
-        ][:max_results]
+        filtered_recommendations = []
+        for rec in diverse_recommendations:
+            if rec['final_score'] < min_threshold:
+                continue
+            if len(filtered_recommendations) == max_results:
+                break
+            i, idx = rec['row'], int(indices[rec['row']])
+            row_components = {name: values[i] for name, values in components.items()}
+            filtered_recommendations.append(self._create_recommendation_dict(
+                self._row(idx), rec['final_score'], candidate, row_components, idx))
 
         # Add skill gap analysis for top recommendations
         if cold_start_config['skill_gap_analysis']:
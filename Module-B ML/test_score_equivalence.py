@@ -0,0 +1,163 @@
+"""
+Equivalence tests for the batched scoring paths of the recommendation engine.
+
+The batched scorer, the diversity tracker and prefiltered retrieval must agree with the
+per-internship implementations they replace. The engine runs over a small in-memory
+dataset and HNSW index instead of the artifacts written by build_index.py.
+
+Run with: pytest test_score_equivalence.py
+"""
+
+import os
+from datetime import date, timedelta
+
+import faiss
+import numpy as np
+import pandas as pd
+import pytest
+
+from recommendation_engine import (DiversityTracker, InternshipRecommendationEngine, SCORE_COMPONENTS,
+                                   add_normalized_columns)
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.yml')
+
+LOCATIONS = [('Bangalore', 'Bangalore Urban', 'Karnataka'), ('Mumbai', 'Mumbai City', 'Maharashtra'),
+             ('Pune', 'Pune', 'Maharashtra'), ('Kolkata', 'Kolkata', 'West Bengal')]
+# Fewer rows than retrieval_prefilter.min_candidates, like the sparse cities in the bundled data
+SPARSE_LOCATION = ('Chennai', 'Chennai', 'Tamil Nadu')
+SECTORS = ['technology', 'finance', 'healthcare', 'design', 'technology, research']
+ORGANIZATIONS = ['Acme Labs', 'Globex', 'Initech', 'Umbrella Health', 'Stark Finance', 'Wayne Design']
+SKILLS = ['python, django, sql', 'react, javascript, git', 'excel, powerpoint', 'photoshop, figma',
+          'machine_learning, pandas, python', 'docker, aws, linux', 'data analysis, sql, excel', '']
+STIPENDS = ['10000', '5000-15000', '20000', '', 'Unpaid', '12000-18000', '8000']
+QUALIFICATIONS = ['12th', 'diploma', 'ug', 'pg', 'phd', '']
+EXPERIENCE = ['', 'Fresher', '1-3 years', '3-5 yrs', 'Experienced', 'Entry level']
+
+CANDIDATES = [
+    {'education_level': 'ug', 'major_field': 'Computer Science', 'skills': ['python', 'javascript', 'data analysis'],
+     'preferred_sectors': ['technology', 'research'], 'preferred_locations': ['bangalore', 'karnataka'],
+     'remote_ok': True, 'years_of_experience': 1, 'stipend_pref': '10000-20000'},
+    {'education_level': 'diploma', 'skills': ['photoshop', 'figma', 'react'], 'preferred_sectors': ['design'],
+     'preferred_locations': ['Kolkata'], 'remote_ok': False, 'years_of_experience': 3},
+    {'education_level': '12th', 'skills': ['excel', 'sql'], 'preferred_sectors': ['finance', 'technology'],
+     'preferred_locations': ['Pune', 'Maharashtra'], 'remote_ok': True, 'stipend_pref': '5000'},
+    {'education_level': 'pg', 'skills': ['django', 'machine_learning', 'git', 'docker', 'aws'],
+     'preferred_sectors': ['technology', 'healthcare'], 'remote_ok': True, 'years_of_experience': 6},
+]
+
+
+def make_internships(n_rows: int = 64) -> pd.DataFrame:
+    """Deterministic internship rows cycling through the value lists above."""
+    rows = []
+    for i in range(n_rows):
+        city, district, state = SPARSE_LOCATION if i % 16 == 15 else LOCATIONS[i % len(LOCATIONS)]
+        rows.append({
+            'internship_id': f'INT{i:04d}',
+            'title': f'Intern {i}',
+            'organization': ORGANIZATIONS[i % len(ORGANIZATIONS)],
+            'sector_tags': SECTORS[i % len(SECTORS)],
+            'description': f'Internship number {i}',
+            'preferred_skills': SKILLS[i % len(SKILLS)],
+            'stipend': STIPENDS[i % len(STIPENDS)],
+            'location_city': city,
+            'location_district': district,
+            'location_state': state,
+            'remote_allowed': 'yes' if i % 3 == 0 else 'no',
+            'duration_weeks': 8 + i % 16,
+            'application_deadline': (date.today() + timedelta(days=30)).isoformat(),
+            'eligibility_min_qualification': QUALIFICATIONS[i % len(QUALIFICATIONS)],
+            'experience_required': EXPERIENCE[i % len(EXPERIENCE)],
+            'url': f'https://example.com/{i}',
+            'posted_date': (date.today() - timedelta(days=(i * 5) % 120)).isoformat(),
+        })
+    return pd.DataFrame(rows)
+
+
+class FixtureEngine(InternshipRecommendationEngine):
+    """Engine over an in-memory dataset, with no encoder and an HNSW index built on the spot."""
+
+    def __init__(self, internships: pd.DataFrame, embeddings: np.ndarray, model_dir: str):
+        self._fixture = (internships, embeddings)
+        super().__init__(config_path=CONFIG_PATH, model_dir=model_dir)
+
+    def _load_model_and_index(self):
+        internships, embeddings = self._fixture
+        self.internships_df = add_normalized_columns(internships.copy())
+        self.embeddings = embeddings
+        self.index = faiss.IndexHNSWFlat(embeddings.shape[1], 32, faiss.METRIC_INNER_PRODUCT)
+        self.index.hnsw.efSearch = self.config.get('hnsw_ef_search', 64)
+        self.index.add(embeddings)
+        self._precompute_internship_features()
+
+
+@pytest.fixture(scope='module')
+def engine(tmp_path_factory):
+    internships = make_internships()
+    embeddings = np.random.default_rng(0).standard_normal((len(internships), 16)).astype(np.float32)
+    faiss.normalize_L2(embeddings)
+    return FixtureEngine(internships, embeddings, str(tmp_path_factory.mktemp('models')))
+
+
+def as_recommendation(row) -> dict:
+    """The recommendation fields calculate_diversity_score reads."""
+    return {'sector_tags': str(row['sector_tags']), 'location': {'city': str(row['location_city'])},
+            'organization': str(row['organization']), 'stipend': str(row['stipend'])}
+
+
+@pytest.mark.parametrize('candidate', CANDIDATES)
+def test_combined_scores_match_scalar_path(engine, candidate):
+    positions = np.arange(len(engine.internships_df))
+    embedding_scores = np.linspace(-0.2, 1.2, len(positions)).astype(np.float32)
+
+    final_scores, components = engine.calculate_combined_scores(embedding_scores, positions, candidate)
+
+    current = []
+    for i, position in enumerate(positions.tolist()):
+        row = engine._row(position)
+        expected_score, expected = engine.calculate_combined_score(embedding_scores[i], row, candidate, current)
+        # The scalar sum stays in float32 when given a float32 embedding score; the batched one is float64
+        assert final_scores[i] == pytest.approx(expected_score, abs=1e-6)
+        for name in SCORE_COMPONENTS:
+            assert components[name][i] == pytest.approx(expected[name]), name
+        for name in ('qualification_reason', 'experience_reason', 'skill_details'):
+            assert components[name][i] == expected[name], name
+        current.append(as_recommendation(row))
+
+
+def test_diversity_tracker_matches_scalar_path(engine):
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        sequence = rng.integers(0, len(engine.internships_df), size=rng.integers(1, 30)).tolist()
+        tracker = DiversityTracker(engine, len(sequence))
+        current = []
+        for position in sequence:
+            row = engine._row(position)
+            assert tracker.diversity_score(position) == pytest.approx(
+                engine.calculate_diversity_score(row, current))
+            tracker.add(position)
+            current.append(as_recommendation(row))
+
+
+@pytest.mark.parametrize('exact_search_multiple', [10, 0], ids=['exact', 'filtered_index'])
+@pytest.mark.parametrize('top_k', [5, 50])
+def test_prefiltered_retrieval_respects_location_filter(engine, monkeypatch, exact_search_multiple, top_k):
+    monkeypatch.setitem(engine.config['retrieval_prefilter'], 'exact_search_multiple', exact_search_multiple)
+    rng = np.random.default_rng(2)
+
+    for preferred in (['Bangalore'], ['Maharashtra'], ['Kolkata', 'Pune'], ['Chennai'], ['Chennai', 'Mumbai']):
+        candidate = {'preferred_locations': preferred, 'remote_ok': False}
+        allowed = engine._prefilter_internship_ids(candidate)
+        assert allowed is not None
+        assert len(allowed) > 0
+
+        query = rng.standard_normal(engine.embeddings.shape[1]).astype(np.float32)
+        scores, indices = engine.retrieve_similar_internships(query, top_k, candidate)
+
+        assert set(indices.tolist()) <= set(allowed.tolist())
+        assert len(indices) == min(top_k, len(allowed))
+        assert np.all(np.diff(scores) <= 1e-6)  # best match first
+
+        wanted = {location.lower() for location in preferred}
+        for position in indices.tolist():
+            row = engine._row(position)
+            assert wanted & {row['location_city_lower'], row['location_district_lower'], row['location_state_lower']}